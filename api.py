@@ -5,20 +5,30 @@ Public HTTP API for converting PubMed articles (by PMID or PMCID) to markdown.
 """
 
 import asyncio
+import os
 import re
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional
-
-from fastapi import FastAPI, HTTPException, Query, Request
+from functools import partial
+from pathlib import Path
+from typing import Awaitable, List, Literal, Optional, Tuple
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from loguru import logger
 from pydantic import BaseModel, Field, field_validator
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-from pubmed_downloader import PubMedDownloader
+from pubmed_downloader.html_from_pmcid import create_async_client
+from pubmed_downloader.markdown_from_html import convert_html_worker
 
 # ---------------------------------------------------------------------------
 # Rate limiting
@@ -32,17 +42,60 @@ limiter = Limiter(key_func=get_remote_address)
 NCBI_CONCURRENCY = 3
 _ncbi_semaphore: asyncio.Semaphore
 
+# Pooled HTTP/2 client shared by all PMC HTML fetches (keep-alive across PMCIDs).
+_http_client: httpx.AsyncClient
+
+# ---------------------------------------------------------------------------
+# HTML→markdown conversion is CPU-bound; run it in worker processes so it
+# scales across cores and never queues behind blocking I/O in the default
+# thread pool.
+# ---------------------------------------------------------------------------
+_cpu_pool: ProcessPoolExecutor
+
+# ---------------------------------------------------------------------------
+# On-disk cache of converted article markdown (without supplements), keyed by
+# PMCID, so repeat conversions skip both the NCBI fetch and the converter.
+# Lives under the package cache dir so clear_all_caches() wipes it too.
+# ---------------------------------------------------------------------------
+MARKDOWN_CACHE_DIR = Path(os.getenv("PMID_CACHE_DIR", "data/cache")) / "markdown"
+MARKDOWN_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
 # ---------------------------------------------------------------------------
-# In-memory job store for batch conversions
+# In-process cache of finished conversions, keyed by (PMCID, include_supplements).
+# Kept small since each entry holds a full article, and entries expire so
+# supplements published after the first conversion are eventually picked up.
 # ---------------------------------------------------------------------------
-_jobs: Dict[str, dict] = {}
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL_SECONDS = 60 * 60
+_result_cache: TTLCache = TTLCache(
+    maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL_SECONDS
+)
+
+# Lets browsers/CDNs reuse successful single-article responses.
+CACHE_CONTROL = "public, max-age=3600"
+
+# ---------------------------------------------------------------------------
+# Job store for batch conversions. Entries expire after JOB_TTL_SECONDS, and
+# completed results are written to JOBS_DIR so memory only holds in-flight
+# jobs rather than every article ever converted.
+# ---------------------------------------------------------------------------
+JOB_TTL_SECONDS = 60 * 60
+JOB_CLEANUP_INTERVAL_SECONDS = 5 * 60
+JOBS_DIR = Path("data/jobs")
+_jobs: TTLCache = TTLCache(maxsize=10_000, ttl=JOB_TTL_SECONDS)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _ncbi_semaphore
+    global _ncbi_semaphore, _http_client, _cpu_pool
     _ncbi_semaphore = asyncio.Semaphore(NCBI_CONCURRENCY)
+    _http_client = create_async_client(NCBI_CONCURRENCY)
+    _cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    cleanup_task = asyncio.create_task(_cleanup_jobs_periodically())
     yield
+    cleanup_task.cancel()
+    await _http_client.aclose()
+    _cpu_pool.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(
@@ -50,6 +103,7 @@ app = FastAPI(
     description="Convert PubMed articles to clean, structured markdown via PMID or PMCID.",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.state.limiter = limiter
@@ -70,7 +124,7 @@ app.add_middleware(
 # ---------------------------------------------------------------------------
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=429,
         content={"error": "rate_limit_exceeded", "message": "Too many requests."},
     )
@@ -125,118 +179,173 @@ class JobStatus(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Shared converter instance
+# Helpers
 # ---------------------------------------------------------------------------
-_converter = PubMedDownloader()
+def _markdown_cache_path(pmcid: str) -> Path:
+    return MARKDOWN_CACHE_DIR / f"{pmcid}.md"
 
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-async def _convert_pmid(pmid: str, include_supplements: bool = True) -> ConvertResult:
-    """Run the PMID→markdown pipeline in a thread (it does blocking I/O)."""
-    from pubmed_downloader.pmcid_from_pmid import get_pmcid_from_pmid
-    from pubmed_downloader.html_from_pmcid import get_html_from_pmcid
-    from pubmed_downloader.utils_bioc import format_supplement_as_markdown
+def _read_cached_markdown(pmcid: str) -> Optional[str]:
+    """Return the cached article markdown for a PMCID if it is still fresh."""
+    cache_path = _markdown_cache_path(pmcid)
+    try:
+        if time.time() - cache_path.stat().st_mtime > MARKDOWN_CACHE_TTL_SECONDS:
+            return None
+        return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        return None
 
-    loop = asyncio.get_event_loop()
 
-    async with _ncbi_semaphore:
-        pmcid_mapping = await loop.run_in_executor(None, get_pmcid_from_pmid, [pmid])
-    pmcid = pmcid_mapping.get(str(pmid))
-    if pmcid is None:
-        return ConvertResult(
-            id=pmid,
-            id_type="pmid",
-            error="No PMCID found for this PMID. The article may not be available in PubMed Central.",
-        )
+def _write_cached_markdown(pmcid: str, markdown: str) -> None:
+    """Cache the article markdown; written to a temp file first so readers never see partial writes."""
+    cache_path = _markdown_cache_path(pmcid)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        MARKDOWN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(markdown, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(f"Failed to cache markdown for {pmcid}: {e}")
+
+
+async def _get_article_markdown(pmcid: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the article markdown (without supplements) for a PMCID, from the disk
+    cache when fresh, otherwise by fetching and converting the PMC HTML.
+
+    Returns:
+        (markdown, error): exactly one of the two is None
+    """
+    from pubmed_downloader.html_from_pmcid import aget_html_from_pmcid
+
+    loop = asyncio.get_running_loop()
+
+    cached = await loop.run_in_executor(None, _read_cached_markdown, pmcid)
+    if cached is not None:
+        return cached, None
 
     async with _ncbi_semaphore:
-        html = await loop.run_in_executor(None, get_html_from_pmcid, pmcid)
+        html = await aget_html_from_pmcid(pmcid, _http_client)
     if html is None:
-        return ConvertResult(
-            id=pmid,
-            id_type="pmid",
-            pmcid=pmcid,
-            error="Failed to fetch HTML from PubMed Central.",
-        )
+        return None, "Failed to fetch HTML from PubMed Central."
 
     try:
-        markdown = await loop.run_in_executor(
-            None, _converter.html_to_markdown.convert_html, html
-        )
+        markdown = await loop.run_in_executor(_cpu_pool, convert_html_worker, html)
     except Exception as e:
+        return None, f"HTML to markdown conversion failed: {e}"
+
+    await loop.run_in_executor(None, _write_cached_markdown, pmcid, markdown)
+    return markdown, None
+
+
+async def _get_supplement(pmcid: str, include_supplements: bool) -> Optional[str]:
+    """Get the supplementary materials section for a PMCID, if requested."""
+    from pubmed_downloader.utils_bioc import format_supplement_as_markdown
+
+    if not include_supplements:
+        return None
+    loop = asyncio.get_running_loop()
+    async with _ncbi_semaphore:
+        return await loop.run_in_executor(None, format_supplement_as_markdown, pmcid)
+
+
+def _supplement_settled(pmcid: str, include_supplements: bool) -> bool:
+    """Whether a missing supplement is BioC's definitive answer rather than a transient failure."""
+    from pubmed_downloader.utils_bioc import _load_cache
+
+    if not include_supplements:
+        return True
+    cached = _load_cache(pmcid)
+    return bool(cached and cached.get("not_available"))
+
+
+async def _convert_known_pmcid(
+    id: str, id_type: str, pmcid: str, include_supplements: bool
+) -> ConvertResult:
+    """Build the markdown for a resolved PMCID; article and supplement are fetched concurrently."""
+    key = (pmcid, include_supplements)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        markdown, has_supplements = cached
         return ConvertResult(
-            id=pmid,
-            id_type="pmid",
+            id=id,
+            id_type=id_type,
             pmcid=pmcid,
-            error=f"HTML to markdown conversion failed: {e}",
+            markdown=markdown,
+            has_supplements=has_supplements,
         )
 
+    (markdown, error), supplement = await asyncio.gather(
+        _get_article_markdown(pmcid), _get_supplement(pmcid, include_supplements)
+    )
+    if markdown is None:
+        return ConvertResult(id=id, id_type=id_type, pmcid=pmcid, error=error)
+
     has_supplements = False
-    if include_supplements:
-        async with _ncbi_semaphore:
-            supplement = await loop.run_in_executor(
-                None, format_supplement_as_markdown, pmcid
-            )
-        if supplement:
-            markdown = markdown.rstrip() + "\n\n" + supplement + "\n"
-            has_supplements = True
+    if supplement:
+        markdown = markdown.rstrip() + "\n\n" + supplement + "\n"
+        has_supplements = True
+
+    # A missing supplement may just be a failed BioC request; only cache it
+    # once BioC has definitively reported that none exists
+    loop = asyncio.get_running_loop()
+    if has_supplements or await loop.run_in_executor(
+        None, _supplement_settled, pmcid, include_supplements
+    ):
+        _result_cache[key] = (markdown, has_supplements)
 
     return ConvertResult(
-        id=pmid,
-        id_type="pmid",
+        id=id,
+        id_type=id_type,
         pmcid=pmcid,
         markdown=markdown,
         has_supplements=has_supplements,
     )
 
 
-async def _convert_pmcid(pmcid: str, include_supplements: bool = True) -> ConvertResult:
-    """Run the PMCID→markdown pipeline in a thread (it does blocking I/O)."""
-    from pubmed_downloader.html_from_pmcid import get_html_from_pmcid
-    from pubmed_downloader.utils_bioc import format_supplement_as_markdown
+async def _convert_pmid(pmid: str, include_supplements: bool = True) -> ConvertResult:
+    """Run the PMID→markdown pipeline; blocking steps are dispatched to threads."""
+    from pubmed_downloader.pmcid_from_pmid import get_pmcid_from_pmid
 
     loop = asyncio.get_event_loop()
 
     async with _ncbi_semaphore:
-        html = await loop.run_in_executor(None, get_html_from_pmcid, pmcid)
-    if html is None:
-        return ConvertResult(
-            id=pmcid,
-            id_type="pmcid",
-            pmcid=pmcid,
-            error="Failed to fetch HTML from PubMed Central.",
-        )
+        pmcid_mapping = await loop.run_in_executor(None, get_pmcid_from_pmid, [pmid])
+    return await _convert_pmid_with_pmcid(
+        pmid, pmcid_mapping.get(str(pmid)), include_supplements
+    )
 
-    try:
-        markdown = await loop.run_in_executor(
-            None, _converter.html_to_markdown.convert_html, html
-        )
-    except Exception as e:
+
+async def _convert_pmid_with_pmcid(
+    pmid: str, pmcid: Optional[str], include_supplements: bool = True
+) -> ConvertResult:
+    """Run the PMID→markdown pipeline for a PMID whose PMCID is already resolved."""
+    if pmcid is None:
         return ConvertResult(
-            id=pmcid,
-            id_type="pmcid",
-            pmcid=pmcid,
-            error=f"HTML to markdown conversion failed: {e}",
+            id=pmid,
+            id_type="pmid",
+            error="No PMCID found for this PMID. The article may not be available in PubMed Central.",
         )
 
-    has_supplements = False
-    if include_supplements:
-        async with _ncbi_semaphore:
-            supplement = await loop.run_in_executor(
-                None, format_supplement_as_markdown, pmcid
-            )
-        if supplement:
-            markdown = markdown.rstrip() + "\n\n" + supplement + "\n"
-            has_supplements = True
+    return await _convert_known_pmcid(pmid, "pmid", pmcid, include_supplements)
 
-    return ConvertResult(
-        id=pmcid,
-        id_type="pmcid",
-        pmcid=pmcid,
-        markdown=markdown,
-        has_supplements=has_supplements,
+
+async def _convert_pmcid(pmcid: str, include_supplements: bool = True) -> ConvertResult:
+    """Run the PMCID→markdown pipeline; blocking steps are dispatched to threads."""
+    return await _convert_known_pmcid(pmcid, "pmcid", pmcid, include_supplements)
+
+
+def _markdown_response(result: ConvertResult) -> PlainTextResponse:
+    """Return the markdown body as-is, skipping model validation and JSON escaping."""
+    return PlainTextResponse(
+        result.markdown,
+        media_type="text/markdown; charset=utf-8",
+        headers={
+            "Cache-Control": CACHE_CONTROL,
+            "X-PMCID": result.pmcid or "",
+            "X-Has-Supplements": str(result.has_supplements).lower(),
+        },
     )
 
 
@@ -252,10 +361,12 @@ async def health():
 @limiter.limit("10/minute")
 async def convert_pmid(
     request: Request,
+    response: Response,
     pmid: str,
     include_supplements: bool = Query(True),
+    output_format: Literal["json", "markdown"] = Query("json", alias="format"),
 ):
-    """Convert a single PMID to markdown."""
+    """Convert a single PMID to markdown. Use `format=markdown` for a plain-text body."""
     if not PMID_PATTERN.match(pmid):
         raise HTTPException(status_code=422, detail="PMID must be numeric.")
     result = await _convert_pmid(pmid, include_supplements)
@@ -268,6 +379,9 @@ async def convert_pmid(
                 "pmid": pmid,
             },
         )
+    if output_format == "markdown":
+        return _markdown_response(result)
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return result
 
 
@@ -275,10 +389,15 @@ async def convert_pmid(
 @limiter.limit("10/minute")
 async def convert_pmcid(
     request: Request,
+    response: Response,
     pmcid: str,
     include_supplements: bool = Query(True),
+    output_format: Literal["json", "markdown"] = Query("json", alias="format"),
 ):
-    """Convert a single PMCID to markdown, skipping PMID resolution."""
+    """
+    Convert a single PMCID to markdown, skipping PMID resolution.
+    Use `format=markdown` for a plain-text body.
+    """
     if not PMCID_PATTERN.match(pmcid):
         raise HTTPException(
             status_code=422, detail="PMCID must match pattern PMC followed by digits."
@@ -293,34 +412,129 @@ async def convert_pmcid(
                 "pmcid": pmcid,
             },
         )
+    if output_format == "markdown":
+        return _markdown_response(result)
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return result
 
 
 # ---------------------------------------------------------------------------
 # Batch endpoints — return a job ID, process in background
 # ---------------------------------------------------------------------------
+def _job_results_path(job_id: str) -> Path:
+    return JOBS_DIR / f"{job_id}.json"
+
+
+def _save_job_results(job_id: str, results: List[dict]) -> Path:
+    results_path = _job_results_path(job_id)
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    results_path.write_bytes(orjson.dumps(results))
+    return results_path
+
+
+def _load_job_results(results_path: str) -> Optional[List[dict]]:
+    try:
+        return orjson.loads(Path(results_path).read_bytes())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Failed to load job results from {results_path}: {e}")
+        return None
+
+
+def _remove_expired_job_files() -> None:
+    """Delete result files older than the job TTL."""
+    if not JOBS_DIR.exists():
+        return
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for results_path in JOBS_DIR.glob("*.json"):
+        try:
+            if results_path.stat().st_mtime < cutoff:
+                results_path.unlink()
+        except OSError:
+            pass
+
+
+async def _cleanup_jobs_periodically():
+    """Evict expired jobs from memory and their result files from disk."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(JOB_CLEANUP_INTERVAL_SECONDS)
+        _jobs.expire()
+        await loop.run_in_executor(None, _remove_expired_job_files)
+
+
+async def _run_job(job_id: str, coros: List[Awaitable[ConvertResult]]):
+    """Run a job's conversions concurrently; `_ncbi_semaphore` is the only gate."""
+    # Hold on to the entry itself so progress updates survive TTL eviction
+    job = _jobs[job_id]
+    job["status"] = "running"
+    results: List[Optional[ConvertResult]] = [None] * len(coros)
+
+    async def run_one(index: int, coro: Awaitable[ConvertResult]):
+        results[index] = await coro
+        job["completed_count"] += 1
+
+    await asyncio.gather(*(run_one(i, coro) for i, coro in enumerate(coros)))
+
+    loop = asyncio.get_running_loop()
+    results_path = await loop.run_in_executor(
+        None, _save_job_results, job_id, [r.model_dump() for r in results]
+    )
+    # Re-insert so the TTL counts from completion
+    _jobs[job_id] = {
+        "status": "completed",
+        "total": job["total"],
+        "completed_count": job["completed_count"],
+        "results": None,
+        "results_path": str(results_path),
+    }
+
+
+async def _prefetch_supplements(pmcids: List[str], include_supplements: bool):
+    """Warm the BioC cache for a whole job so per-item supplement lookups are cache hits."""
+    from pubmed_downloader.utils_bioc import prefetch_bioc_supplements
+
+    if not include_supplements or not pmcids:
+        return
+    loop = asyncio.get_running_loop()
+    # One slot covers one request in flight, so keep the prefetch sequential
+    async with _ncbi_semaphore:
+        await loop.run_in_executor(
+            None, partial(prefetch_bioc_supplements, pmcids, max_concurrency=1)
+        )
+
+
 async def _run_batch_pmid_job(job_id: str, pmids: List[str], include_supplements: bool):
-    _jobs[job_id]["status"] = "running"
-    results: List[ConvertResult] = []
-    for pmid in pmids:
-        result = await _convert_pmid(pmid, include_supplements)
-        results.append(result)
-        _jobs[job_id]["completed_count"] = len(results)
-    _jobs[job_id]["status"] = "completed"
-    _jobs[job_id]["results"] = [r.model_dump() for r in results]
+    from pubmed_downloader.pmcid_from_pmid import get_pmcid_from_pmid
+
+    # Resolve every PMID up front; idconv takes up to 200 IDs per request
+    loop = asyncio.get_running_loop()
+    # Large jobs span several idconv batches; fetch them one at a time under the slot
+    async with _ncbi_semaphore:
+        pmcid_mapping = await loop.run_in_executor(
+            None, partial(get_pmcid_from_pmid, pmids, max_concurrency=1)
+        )
+    await _prefetch_supplements(
+        [pmcid for pmcid in pmcid_mapping.values() if pmcid], include_supplements
+    )
+
+    await _run_job(
+        job_id,
+        [
+            _convert_pmid_with_pmcid(
+                pmid, pmcid_mapping.get(str(pmid)), include_supplements
+            )
+            for pmid in pmids
+        ],
+    )
 
 
 async def _run_batch_pmcid_job(
     job_id: str, pmcids: List[str], include_supplements: bool
 ):
-    _jobs[job_id]["status"] = "running"
-    results: List[ConvertResult] = []
-    for pmcid in pmcids:
-        result = await _convert_pmcid(pmcid, include_supplements)
-        results.append(result)
-        _jobs[job_id]["completed_count"] = len(results)
-    _jobs[job_id]["status"] = "completed"
-    _jobs[job_id]["results"] = [r.model_dump() for r in results]
+    await _prefetch_supplements(pmcids, include_supplements)
+    await _run_job(
+        job_id, [_convert_pmcid(pmcid, include_supplements) for pmcid in pmcids]
+    )
 
 
 @app.post("/convert/pmids", response_model=JobStatus)
@@ -367,10 +581,18 @@ async def get_job_status(job_id: str):
     job = _jobs.get(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found.")
+    results = job["results"]
+    if job.get("results_path"):
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None, _load_job_results, job["results_path"]
+        )
+        if results is None:
+            raise HTTPException(status_code=404, detail="Job results expired.")
     return JobStatus(
         job_id=job_id,
         status=job["status"],
         total=job["total"],
         completed_count=job["completed_count"],
-        results=job["results"],
+        results=results,
     )
@@ -1,17 +1,19 @@
-from .html_from_pmcid import get_html_from_pmcid
+from .html_from_pmcid import get_html_from_pmcid, aget_html_from_pmcid
 from .pmcid_from_pmid import get_pmcid_from_pmid
 from .manage_records import get_scraped_pmids
 from .pubmed_downloader import PubMedDownloader
 from .utils_bioc import fetch_bioc_supplement, format_supplement_as_markdown, prefetch_bioc_supplements
-from .abstract_from_pmid import get_abstract_markdown_from_pmid
+from .abstract_from_pmid import get_abstract_markdown_from_pmid, get_abstracts_markdown_from_pmids
 
 __all__ = [
     "PubMedDownloader",
     "get_html_from_pmcid",
+    "aget_html_from_pmcid",
     "get_pmcid_from_pmid",
     "get_scraped_pmids",
     "fetch_bioc_supplement",
     "format_supplement_as_markdown",
     "prefetch_bioc_supplements",
     "get_abstract_markdown_from_pmid",
+    "get_abstracts_markdown_from_pmids",
 ]
@@ -0,0 +1,63 @@
+"""
+Helpers shared by the modules that drive asyncio code from synchronous entry
+points and pace their requests to NCBI.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code. If this thread already
+    has a running event loop (e.g. a notebook), run it on a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class RateLimiter:
+    """Spaces request starts at least `interval` seconds apart across all tasks on a loop."""
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._next_start = 0.0
+        self._resume_at = 0.0
+        self._generation = 0
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            generation = self._generation
+            now = loop.time()
+            start = max(now, self._next_start)
+            # Reserve the slot before sleeping so concurrent callers queue up behind it
+            self._next_start = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            if generation == self._generation:
+                return
+            # back_off() ran while we slept, voiding our slot; queue again
+
+    def back_off(self, seconds: float) -> None:
+        """Hold every caller for `seconds`, e.g. after the server answered 429."""
+        self._resume_at = max(
+            self._resume_at, asyncio.get_running_loop().time() + seconds
+        )
+        self._next_start = self._resume_at
+        self._generation += 1
+
+
+def retry_after_seconds(response: httpx.Response) -> float:
+    """Seconds to wait from a Retry-After header, defaulting to 1."""
+    try:
+        return min(max(float(response.headers.get("Retry-After", "1")), 0.0), 60.0)
+    except ValueError:
+        # HTTP-date form; not worth parsing for a short back-off
+        return 1.0
@@ -2,13 +2,51 @@
 PMID --> Abstract (via NCBI E-Fetch API)
 
 Fetches the abstract and basic metadata for articles that are not available
-in PubMed Central (no PMCID). Returns a simple markdown-formatted string.
+in PubMed Central (no PMCID). Returns a simple markdown-formatted string, or
+a dict of them when fetching many PMIDs in batched requests.
 """
 
+import time
 import requests
-import xml.etree.ElementTree as ET
-from typing import Optional
+from lxml import etree
+from typing import Dict, List, Optional
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _create_session() -> requests.Session:
+    """Create a session that keeps connections to NCBI alive and retries transient failures."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # E-Fetch POSTs are read-only lookups, so they are safe to retry
+            allowed_methods=["GET", "POST"],
+            # Hand the final response back so raise_for_status reports it
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _create_session()
+
+# Compiled once; each .find(".//...") would otherwise re-parse its path
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+_ARTICLE = etree.XPath("//PubmedArticle")
+_ARTICLE_PMID = etree.XPath("./MedlineCitation/PMID")
+_TITLE = etree.XPath(".//ArticleTitle")
+_AUTHORS = etree.XPath(".//Author")
+_ABSTRACT_TEXTS = etree.XPath(".//AbstractText")
+_JOURNAL_TITLE = etree.XPath(".//Journal/Title")
+_PUB_YEAR = etree.XPath(".//PubDate/Year")
+_DOI = etree.XPath(".//ArticleId[@IdType='doi']")
 
 
 def get_abstract_markdown_from_pmid(pmid: str) -> Optional[str]:
@@ -21,39 +59,90 @@ def get_abstract_markdown_from_pmid(pmid: str) -> Optional[str]:
     Returns:
         Optional[str]: Markdown-formatted abstract with title/authors, or None on failure
     """
+    pmid = str(pmid).strip()
+    return get_abstracts_markdown_from_pmids([pmid]).get(pmid)
+
+
+def get_abstracts_markdown_from_pmids(
+    pmids: List[str], batch_size: int = 200, delay: float = 0.4
+) -> Dict[str, str]:
+    """
+    Fetch abstracts for many PMIDs, one E-Fetch request per batch.
+
+    Args:
+        pmids (List[str]): The PubMed IDs to fetch
+        batch_size (int): Number of PMIDs per request (max: 200)
+        delay (float): Seconds to wait between requests (default 0.4 to respect NCBI)
+
+    Returns:
+        Dict[str, str]: Markdown-formatted abstract for each PMID that could be fetched
+    """
+    pmids = list(dict.fromkeys(str(pmid).strip() for pmid in pmids))
+    results = {}
+
+    for i in range(0, len(pmids), batch_size):
+        if i > 0:
+            time.sleep(delay)
+        batch = pmids[i : i + batch_size]
+        articles = _fetch_articles(batch)
+        if articles is None:
+            continue
+
+        for pmid in batch:
+            article = articles.get(pmid)
+            if article is None and len(batch) == 1 and articles:
+                # A lone request can only be answered by its one article, even if
+                # PubMed reports it under another PMID (e.g. a merged record)
+                article = next(iter(articles.values()))
+            if article is None:
+                logger.error(f"No article found in response for PMID {pmid}")
+                continue
+            results[pmid] = _render_article(article, pmid)
+
+    return results
+
+
+def _fetch_articles(pmids: List[str]) -> Optional[Dict[str, etree._Element]]:
+    """POST one E-Fetch request and map each returned PMID to its PubmedArticle element."""
+    label = pmids[0] if len(pmids) == 1 else f"{pmids[0]}..{pmids[-1]} ({len(pmids)} PMIDs)"
     url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-    params = {
+    # POST keeps long ID lists out of the URL
+    data = {
         "db": "pubmed",
-        "id": pmid,
+        "id": ",".join(pmids),
         "rettype": "xml",
         "retmode": "xml",
     }
 
     try:
-        response = requests.get(url, params=params)
+        response = _session.post(url, data=data, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to fetch abstract for PMID {pmid}: {e}")
+        logger.error(f"Failed to fetch abstract for PMID {label}: {e}")
         return None
 
     try:
-        root = ET.fromstring(response.text)
-    except ET.ParseError as e:
-        logger.error(f"Failed to parse XML for PMID {pmid}: {e}")
+        root = etree.fromstring(response.content, _PARSER)
+    except etree.XMLSyntaxError as e:
+        logger.error(f"Failed to parse XML for PMID {label}: {e}")
         return None
 
-    article = root.find(".//PubmedArticle")
-    if article is None:
-        logger.error(f"No article found in response for PMID {pmid}")
-        return None
+    articles = {}
+    for article in _ARTICLE(root):
+        article_pmid = _first_text(_ARTICLE_PMID(article)).strip()
+        articles.setdefault(article_pmid, article)
+    return articles
 
+
+def _render_article(article: etree._Element, pmid: str) -> str:
+    """Render one PubmedArticle element as markdown."""
     # Extract title
-    title_el = article.find(".//ArticleTitle")
-    title = _get_element_text(title_el) if title_el is not None else "Unknown Title"
+    title_els = _TITLE(article)
+    title = _get_element_text(title_els[0]) if title_els else "Unknown Title"
 
     # Extract authors
     authors = []
-    for author in article.findall(".//Author"):
+    for author in _AUTHORS(article):
         last = author.findtext("LastName", "")
         fore = author.findtext("ForeName", "")
         if last:
@@ -61,7 +150,7 @@ def get_abstract_markdown_from_pmid(pmid: str) -> Optional[str]:
 
     # Extract abstract
     abstract_parts = []
-    for abstract_text in article.findall(".//AbstractText"):
+    for abstract_text in _ABSTRACT_TEXTS(article):
         label = abstract_text.get("Label")
         text = _get_element_text(abstract_text)
         if text:
@@ -73,10 +162,10 @@ def get_abstract_markdown_from_pmid(pmid: str) -> Optional[str]:
     abstract = "\n\n".join(abstract_parts) if abstract_parts else "No abstract available."
 
     # Extract journal info
-    journal = article.findtext(".//Journal/Title", "")
-    year = article.findtext(".//PubDate/Year", "")
-    doi_el = article.find(".//ArticleId[@IdType='doi']")
-    doi = doi_el.text if doi_el is not None and doi_el.text else None
+    journal = _first_text(_JOURNAL_TITLE(article))
+    year = _first_text(_PUB_YEAR(article))
+    doi_els = _DOI(article)
+    doi = doi_els[0].text if doi_els and doi_els[0].text else None
 
     # Build markdown
     lines = []
@@ -104,6 +193,11 @@ def get_abstract_markdown_from_pmid(pmid: str) -> Optional[str]:
     return "\n".join(lines)
 
 
+def _first_text(elements) -> str:
+    """Text of the first matched element, or "" (like ElementTree's findtext)."""
+    return (elements[0].text or "") if elements else ""
+
+
 def _get_element_text(element) -> str:
     """Extract all text from an element, including text within child tags (e.g. <i>, <b>)."""
     return "".join(element.itertext()).strip()
@@ -1,5 +1,6 @@
 from typing import List
 import os
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 from loguru import logger
 from pathlib import Path
@@ -9,17 +10,30 @@ Pass in a list of PMCIDs and have those files copied to a new folder
 """
 
 
+_COPY_WORKERS = 16
+
+
+def _copy_one(pmcid: str, source: Path, destination: Path) -> bool:
+    try:
+        # copyfile skips copy2's metadata stat/utime calls; it still uses
+        # sendfile for the data on Linux
+        shutil.copyfile(source / f"{pmcid}.md", destination / f"{pmcid}.md")
+        return True
+    except Exception as e:
+        logger.error(e)
+        return False
+
+
 def copy_markdown(pmcids: List[str]) -> None:
-    succesful = 0
-    for pmcid in pmcids:
-        try:
-            source_file = Path("data") / "markdown" / f"{pmcid}.md"
-            destination = Path("data") / "extracted" / "markdown"
-            os.makedirs(destination, exist_ok=True)
-            shutil.copy2(source_file, destination / f"{pmcid}.md")
-            succesful += 1
-        except Exception as e:
-            logger.error(e)
+    source = Path("data") / "markdown"
+    destination = Path("data") / "extracted" / "markdown"
+    os.makedirs(destination, exist_ok=True)
+    # Copies are I/O-bound, so a thread pool overlaps the per-file disk waits
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+        results = list(
+            executor.map(lambda pmcid: _copy_one(pmcid, source, destination), pmcids)
+        )
+    succesful = sum(results)
     logger.info(f"Copied {succesful}/{len(pmcids)} markdown to data/extracted/markdown")
 
 
@@ -1,12 +1,95 @@
 """
 PMCID --> Full Article Text (HTML)
-This uses a standard get request with a user agent and accept header to fetch the article text.
+This uses a pooled requests session with a user agent and accept header to fetch the article text.
+An async variant backed by a pooled httpx client is provided for the API.
 """
 
 import argparse
+import threading
+import time
+from collections import deque
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
-from typing import List, Optional, Union
+from typing import Deque, List, Optional, Union
+
+try:
+    import brotli  # noqa: F401
+
+    # requests and httpx only decode brotli bodies when the package is installed
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+PMC_ARTICLE_URL = "https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/?report=classic"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    # Article pages are large HTML documents that compress to roughly a tenth
+    "Accept-Encoding": _ACCEPT_ENCODING,
+}
+
+
+def _create_session() -> requests.Session:
+    """Create a session that keeps connections to NCBI alive and retries transient failures."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            # At most 3 attempts, so one call is bounded by 3 x REQUEST_TIMEOUT
+            total=2,
+            # A connect or read timeout already spent its full budget; fail (and
+            # count toward the circuit breaker) instead of waiting it out again
+            connect=0,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # Hand the final response back so raise_for_status reports it
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _create_session()
+
+# (connect, read) timeouts for article fetches
+REQUEST_TIMEOUT = (5, 30)
+
+# Circuit breaker: after FAILURE_THRESHOLD failures within FAILURE_WINDOW_SECONDS,
+# skip the network for BREAKER_COOLDOWN_SECONDS so an NCBI outage fails fast
+# instead of every caller waiting out its own timeouts and retries.
+FAILURE_THRESHOLD = 10
+FAILURE_WINDOW_SECONDS = 60
+BREAKER_COOLDOWN_SECONDS = 30
+_failure_times: Deque[float] = deque(maxlen=20)
+_breaker_open_until = 0.0
+_breaker_lock = threading.Lock()
+
+
+def _breaker_is_open() -> bool:
+    return time.monotonic() < _breaker_open_until
+
+
+def _record_failure() -> None:
+    global _breaker_open_until
+    now = time.monotonic()
+    with _breaker_lock:
+        _failure_times.append(now)
+        recent = sum(1 for t in _failure_times if now - t <= FAILURE_WINDOW_SECONDS)
+        if recent >= FAILURE_THRESHOLD:
+            _breaker_open_until = now + BREAKER_COOLDOWN_SECONDS
+            _failure_times.clear()
+            logger.warning(
+                f"{recent} NCBI failures in the last {FAILURE_WINDOW_SECONDS}s; "
+                f"skipping article fetches for {BREAKER_COOLDOWN_SECONDS}s"
+            )
 
 
 def get_html_from_pmcid(pmcid: str) -> Optional[str]:
@@ -25,28 +108,108 @@ def get_html_from_pmcid(pmcid: str) -> Optional[str]:
         logger.error("pmcid must be a string")
         return None
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
-    url = f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/?report=classic"
+    if _breaker_is_open():
+        logger.error(
+            f"Skipping PMCID {pmcid}: NCBI is failing, circuit breaker is open"
+        )
+        return None
+
+    url = PMC_ARTICLE_URL.format(pmcid=pmcid)
     try:
-        response = requests.get(url, headers=headers)
+        response = _session.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()  # This will raise an exception for 4XX/5XX status codes
         return response.text
     except requests.exceptions.HTTPError as e:
         logger.error(f"HTTP error occurred for PMCID {pmcid}: {str(e)}")
         if response.text:
             logger.error(f"Server response: {response.text}")
+        # A 404 means the article is missing, not that NCBI is down
+        if response.status_code == 429 or response.status_code >= 500:
+            _record_failure()
         return None
     except requests.exceptions.ConnectionError as e:
         logger.error(f"Connection error occurred for PMCID {pmcid}: {str(e)}")
+        _record_failure()
         return None
     except requests.exceptions.Timeout as e:
         logger.error(f"Request timed out for PMCID {pmcid}: {str(e)}")
+        _record_failure()
         return None
     except requests.exceptions.RequestException as e:
         logger.error(f"An error occurred while fetching PMCID {pmcid}: {str(e)}")
+        _record_failure()
+        return None
+
+
+def create_async_client(max_connections: int = 3) -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP/2 client for fetching PMC articles concurrently.
+    The caller owns the client and must close it with `await client.aclose()`.
+
+    Args:
+        max_connections (int): Maximum number of open (and keep-alive) connections
+
+    Returns:
+        httpx.AsyncClient: The configured client
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        follow_redirects=True,
+        # Same budget as REQUEST_TIMEOUT: give up quickly on a dead host, allow slow reads
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    )
+
+
+async def aget_html_from_pmcid(pmcid: str, client: httpx.AsyncClient) -> Optional[str]:
+    """
+    Async version of `get_html_from_pmcid` that reuses the pooled connections of `client`.
+
+    Args:
+        pmcid (str): The PMCID to fetch
+        client (httpx.AsyncClient): Client created with `create_async_client`
+
+    Returns:
+        Optional[str]: The article html text if successful, None if there was an error
+    """
+    if not isinstance(pmcid, str):
+        logger.error("pmcid must be a string")
+        return None
+
+    if _breaker_is_open():
+        logger.error(
+            f"Skipping PMCID {pmcid}: NCBI is failing, circuit breaker is open"
+        )
+        return None
+
+    url = PMC_ARTICLE_URL.format(pmcid=pmcid)
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error occurred for PMCID {pmcid}: {str(e)}")
+        if e.response.text:
+            logger.error(f"Server response: {e.response.text}")
+        # A 404 means the article is missing, not that NCBI is down
+        if e.response.status_code == 429 or e.response.status_code >= 500:
+            _record_failure()
+        return None
+    except httpx.ConnectError as e:
+        logger.error(f"Connection error occurred for PMCID {pmcid}: {str(e)}")
+        _record_failure()
+        return None
+    except httpx.TimeoutException as e:
+        logger.error(f"Request timed out for PMCID {pmcid}: {str(e)}")
+        _record_failure()
+        return None
+    except httpx.HTTPError as e:
+        logger.error(f"An error occurred while fetching PMCID {pmcid}: {str(e)}")
+        _record_failure()
         return None
 
 
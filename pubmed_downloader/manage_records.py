@@ -4,11 +4,23 @@ Store the record in a json file (data/records.json)
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import re
 from loguru import logger
+import numpy as np
 import pandas as pd
 
+_METADATA_FIELDS = ("PMCID", "PMID", "URL")
+# The metadata block sits right under the title, so this covers it for all but
+# very long author lists
+_METADATA_HEADER_CHARS = 4096
+_SCAN_WORKERS = 16
+_REQUIRED_COLUMNS = ["pmid", "pmcid", "url"]
+# Lookahead so a value that spills onto the next line (e.g. an empty PMCID)
+# does not consume the following field's match.
+_METADATA_RE = re.compile(r"(?=\*\*(PMCID|PMID|URL):\*\*\s*([^\n]+))")
+
 
 def get_scraped_pmids(update: bool = False) -> List[str]:
     """
@@ -57,26 +69,39 @@ def parse_markdown_metadata(markdown_text: str) -> dict:
     # Dictionary to store extracted metadata
     metadata = {}
 
-    # Regular expressions for extraction
-    pmcid_pattern = r"\*\*PMCID:\*\*\s*([^\n]+)"
-    pmid_pattern = r"\*\*PMID:\*\*\s*([^\n]+)"
-    url_pattern = r"\*\*URL:\*\*\s*([^\n]+)"
+    # Single pass over the text; keep the first occurrence of each field
+    for match in _METADATA_RE.finditer(markdown_text):
+        key = match.group(1).lower()
+        if key not in metadata:
+            metadata[key] = match.group(2).strip()
+            if len(metadata) == len(_METADATA_FIELDS):
+                break
 
-    # Extract PMCID
-    pmcid_match = re.search(pmcid_pattern, markdown_text)
-    if pmcid_match:
-        metadata["pmcid"] = pmcid_match.group(1).strip()
+    return metadata
 
-    # Extract PMID
-    pmid_match = re.search(pmid_pattern, markdown_text)
-    if pmid_match:
-        metadata["pmid"] = pmid_match.group(1).strip()
 
-    # Extract URL
-    url_match = re.search(url_pattern, markdown_text)
-    if url_match:
-        metadata["url"] = url_match.group(1).strip()
+def read_markdown_metadata(markdown_file: str) -> dict:
+    """
+    Extract PMID, PMCID, and URL from a markdown file.
+    Only the metadata header at the top of the file is read; the rest of the
+    file is read only if a field is missing from the header.
+
+    Args:
+        markdown_file (str): Path to the markdown file
 
+    Returns:
+        dict: A dictionary containing extracted metadata
+    """
+    with open(markdown_file, "r") as f:
+        head = f.read(_METADATA_HEADER_CHARS)
+        # Finish the current line so a value straddling the cut is not truncated
+        if head and not head.endswith("\n"):
+            head += f.readline()
+        metadata = parse_markdown_metadata(head)
+        if len(metadata) < len(_METADATA_FIELDS):
+            rest = f.read()
+            if rest:
+                metadata = parse_markdown_metadata(head + rest)
     return metadata
 
 
@@ -91,22 +116,42 @@ def validate_records(records: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame containing only the records with missing fields
     """
     # Check for missing values in required columns
-    missing_mask = records[["pmid", "pmcid", "url"]].isna().any(axis=1)
+    missing_matrix = records[_REQUIRED_COLUMNS].isna().to_numpy()
+    missing_mask = missing_matrix.any(axis=1)
     missing_records = records[missing_mask]
 
     if not missing_records.empty:
         logger.warning(f"Found {len(missing_records)} records with missing fields")
-        for _, row in missing_records.iterrows():
-            missing_fields = [
-                col for col in ["pmid", "pmcid", "url"] if pd.isna(row[col])
-            ]
-            logger.warning(
-                f"Record {row['markdown_path']} is missing: {', '.join(missing_fields)}"
+        columns = np.array(_REQUIRED_COLUMNS)
+        details = "\n".join(
+            f"Record {path} is missing: {', '.join(columns[row])}"
+            for path, row in zip(
+                missing_records["markdown_path"], missing_matrix[missing_mask]
             )
+        )
+        logger.warning(details)
 
     return missing_records
 
 
+def _record_from_markdown(markdown_file: str) -> dict:
+    """Build a single record row from a markdown file."""
+    row = {
+        "pmid": None,
+        "pmcid": None,
+        "markdown_path": markdown_file,
+        "url": None,
+    }
+    metadata = read_markdown_metadata(markdown_file)
+    if metadata.get("pmid") is not None:
+        row["pmid"] = metadata["pmid"]
+    if metadata.get("pmcid") is not None:
+        row["pmcid"] = metadata["pmcid"]
+    if metadata.get("url") is not None:
+        row["url"] = metadata["url"]
+    return row
+
+
 def create_records() -> pd.DataFrame:
     """
     Get a list of all the markdown files in the data/articles directory
@@ -116,27 +161,16 @@ def create_records() -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame containing the record map
     """
-    records = []
     markdown_path = os.path.join("data", "markdown")
+    files = [file for file in os.listdir(markdown_path) if file.endswith(".md")]
 
-    for file in os.listdir(markdown_path):
-        if file.endswith(".md"):
-            row = {
-                "pmid": None,
-                "pmcid": None,
-                "markdown_path": f"{markdown_path}/{file}",
-                "url": None,
-            }
-            metadata = parse_markdown_metadata(
-                open(f"{markdown_path}/{file}", "r").read()
+    # Files are independent, so scan them in parallel (I/O bound)
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+        records = list(
+            executor.map(
+                lambda file: _record_from_markdown(f"{markdown_path}/{file}"), files
             )
-            if metadata["pmid"] is not None:
-                row["pmid"] = metadata["pmid"]
-            if metadata["pmcid"] is not None:
-                row["pmcid"] = metadata["pmcid"]
-            if metadata["url"] is not None:
-                row["url"] = metadata["url"]
-            records.append(row)
+        )
 
     # Create DataFrame from list of records
     records = pd.DataFrame(records)
@@ -9,12 +9,143 @@ in pubmed_html_to_markdown_conversion_process.md
 
 import re
 import html
-from typing import Dict
+import functools
+import multiprocessing
+from typing import Dict, List, Optional, Union
 import os
-from bs4 import BeautifulSoup, Tag, NavigableString
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
 from loguru import logger
 import tqdm
 
+# Patterns used on every conversion, compiled once at import
+_WS_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_PMC_NUM_RE = re.compile(r"PMC(\d+)")
+_PMCID_TEXT_RE = re.compile(r"PMCID:\s*PMC\d+")
+_PMC_ANY_RE = re.compile(r"PMC\d+")
+_TITLE_SUFFIX_RE = re.compile(r"\s*-\s*PMC\s*$")
+_TABLE_NUM_RE = re.compile(r"Table\s+(\d+)", re.IGNORECASE)
+
+# Section classes skipped by _extract_main_content (handled elsewhere) and
+# section classes rendered as figures by _process_section
+_SKIP_CLASSES = frozenset({"abstract", "ref-list", "kwd-group"})
+_FIG_CLASSES = frozenset({"fig", "figure"})
+_SECTION_TITLE_TAGS = ("h1", "h2", "h3", "h4")
+
+# Markdown table cell escaping: pipes are escaped, line breaks become spaces
+_CELL_TRANS = str.maketrans({"|": "\\|", "\n": " ", "\r": " "})
+
+# Longer strings are almost always unique paragraph bodies, so they bypass
+# the cache rather than evicting the short, repeated ones
+_CLEAN_TEXT_CACHE_MAX_LEN = 512
+
+
+def _clean_text_nocache(text: str) -> str:
+    """Clean and normalize text."""
+    if not text:
+        return ""
+
+    # Decode HTML entities
+    text = html.unescape(text)
+
+    # Normalize whitespace
+    text = _WS_RE.sub(" ", text)
+
+    # Remove extra whitespace
+    text = text.strip()
+
+    return text
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_text_cached(text: str) -> str:
+    return _clean_text_nocache(text)
+
+
+def _inline_markdown(p_tag: Tag) -> str:
+    """
+    Render a paragraph's contents with inline markdown formatting.
+
+    Formatting tags and links are rendered from their text; any other tag is
+    descended into. Uses an explicit stack of child iterators rather than
+    recursion, and joins the collected parts once at the end.
+    """
+    parts = []
+    stack = [iter(p_tag.contents)]
+    while stack:
+        element = next(stack[-1], None)
+        if element is None:
+            stack.pop()
+        elif isinstance(element, NavigableString):
+            parts.append(str(element))
+        elif isinstance(element, Tag):
+            if element.name == "em" or element.name == "i":
+                parts.append(f"*{element.get_text()}*")
+            elif element.name == "strong" or element.name == "b":
+                parts.append(f"**{element.get_text()}**")
+            elif element.name == "sub":
+                parts.append(f"_{element.get_text()}_")
+            elif element.name == "sup":
+                parts.append(f"^{element.get_text()}^")
+            elif element.name == "a":
+                # Handle citations and cross-references
+                link_text = element.get_text().strip()
+                href = element.get("href", "")
+
+                if href.startswith("#"):
+                    # Internal reference
+                    parts.append(f"[{link_text}]({href})")
+                elif href:
+                    # External link
+                    parts.append(f"[{link_text}]({href})")
+                else:
+                    parts.append(link_text)
+            else:
+                # For any other tag, process its contents
+                stack.append(iter(element.contents))
+    return "".join(parts)
+
+
+def _find_section_title(section: Tag) -> Optional[Tag]:
+    """
+    Find a section's pmc_sec_title heading. PMC puts it among the section's
+    direct children, so check those first and only search the whole subtree
+    (which can be large for deeply nested sections) when it isn't there.
+    """
+    for child in section.children:
+        if (
+            isinstance(child, Tag)
+            and child.name in _SECTION_TITLE_TAGS
+            and "pmc_sec_title" in (child.get("class") or ())
+        ):
+            return child
+    return section.find(list(_SECTION_TITLE_TAGS), class_="pmc_sec_title")
+
+
+def _drop_blank_block(lines: List[str], start: int) -> None:
+    """
+    Remove a block appended at lines[start:] if it renders as an empty string,
+    matching how a separately joined block would have been skipped.
+    """
+    if lines[start:] == [""]:
+        del lines[start:]
+
+
+class _ArticleStrainer(SoupStrainer):
+    """
+    Only build the parts of the page the converter reads: <meta>, <title> and
+    <link> tags plus whole <section> and <figure> subtrees. Scripts, styles,
+    navigation and other page chrome are never turned into tree nodes.
+    Loose strings that look like "PMCID: PMC..." are also kept for the
+    _extract_pmcid fallback.
+    """
+
+    def __init__(self):
+        super().__init__(name=["meta", "title", "link", "section", "figure"])
+
+    def allow_string_creation(self, string: str) -> bool:
+        return _PMCID_TEXT_RE.search(string) is not None
+
 
 class PubMedHTMLToMarkdownConverter:
     """Converts PubMed/PMC HTML articles to markdown format."""
@@ -22,6 +153,14 @@ class PubMedHTMLToMarkdownConverter:
     def __init__(self):
         self.soup = None
         self.base_url = "https://pmc.ncbi.nlm.nih.gov"
+        # Per-document lookups filled by _build_index
+        self._sections_by_class: Dict[str, Tag] = {}
+        self._meta_by_name: Dict[str, Tag] = {}
+        self._authors: List[str] = []
+        self._title_tag: Optional[Tag] = None
+        self._link_canonical: Optional[Tag] = None
+        self._has_scanpage_meta = False
+        self._has_scanned_figure = False
 
     def convert_file(self, html_file_path: str) -> str:
         """
@@ -32,20 +171,23 @@ class PubMedHTMLToMarkdownConverter:
         Returns:
             str: The markdown content
         """
-        with open(html_file_path, "r", encoding="utf-8") as f:
+        # Read raw bytes so lxml can detect the encoding itself instead of
+        # decoding the whole file in Python first
+        with open(html_file_path, "rb") as f:
             html_content = f.read()
         return self.convert_html(html_content)
 
-    def convert_html(self, html_content: str) -> str:
+    def convert_html(self, html_content: Union[str, bytes]) -> str:
         """
         Convert HTML content to markdown string
 
         Args:
-            html_content (str): The HTML content to convert
+            html_content (Union[str, bytes]): The HTML content to convert
         Returns:
             str: The markdown content
         """
-        self.soup = BeautifulSoup(html_content, "html.parser")
+        self.soup = BeautifulSoup(html_content, "lxml", parse_only=_ArticleStrainer())
+        self._build_index()
 
         # Build markdown document
         markdown_parts = []
@@ -69,19 +211,67 @@ class PubMedHTMLToMarkdownConverter:
         markdown = "\n\n".join(filter(None, markdown_parts))
         return self._clean_markdown(markdown)
 
+    def _build_index(self) -> None:
+        """
+        Walk the document once and record the elements the extractors look up,
+        so each lookup is a dict access instead of a full-tree find().
+        Only the first match is kept, mirroring find().
+        """
+        self._sections_by_class = {}
+        self._meta_by_name = {}
+        self._authors = []
+        self._title_tag = None
+        self._link_canonical = None
+        self._has_scanpage_meta = False
+        self._has_scanned_figure = False
+
+        for tag in self.soup.find_all(["section", "meta", "link", "title", "figure"]):
+            if tag.name == "section":
+                for cls in tag.get("class") or ():
+                    self._sections_by_class.setdefault(cls, tag)
+            elif tag.name == "meta":
+                name = tag.get("name")
+                if name == "citation_author":
+                    if tag.get("content"):
+                        self._authors.append(tag["content"].strip())
+                elif name:
+                    self._meta_by_name.setdefault(name, tag)
+                    if name == "ncbi_type" and tag.get("content") == "scanpage":
+                        self._has_scanpage_meta = True
+            elif tag.name == "link":
+                if self._link_canonical is None and "canonical" in (
+                    tag.get("rel") or ()
+                ):
+                    self._link_canonical = tag
+            elif tag.name == "title":
+                if self._title_tag is None:
+                    self._title_tag = tag
+            elif "fig-scanned" in (tag.get("class") or ()):
+                self._has_scanned_figure = True
+
     def _extract_pmcid(self) -> str:
         """Extract PMCID from the HTML"""
         # Look for PMCID in canonical URL or meta tags
-        canonical = self.soup.find("link", {"rel": "canonical"})
+        canonical = self._link_canonical
         if canonical and canonical.get("href"):
-            match = re.search(r"PMC(\d+)", canonical["href"])
+            match = _PMC_NUM_RE.search(canonical["href"])
             if match:
                 return f"PMC{match.group(1)}"
 
-        # Look in text content
-        pmcid_text = self.soup.find(text=re.compile(r"PMCID:\s*PMC\d+"))
+        # PMC pages also carry the PMCID as a citation meta tag (indexed, so free)
+        meta_tag = self._meta_by_name.get("citation_pmcid")
+        if meta_tag and meta_tag.get("content"):
+            content = meta_tag["content"].strip()
+            if content.isdigit():
+                return f"PMC{content}"
+            match = _PMC_ANY_RE.search(content)
+            if match:
+                return match.group(0)
+
+        # Last resort: scan the text content
+        pmcid_text = self.soup.find(string=_PMCID_TEXT_RE)
         if pmcid_text:
-            match = re.search(r"PMC\d+", pmcid_text)
+            match = _PMC_ANY_RE.search(pmcid_text)
             if match:
                 return match.group(0)
 
@@ -104,25 +294,20 @@ class PubMedHTMLToMarkdownConverter:
         }
 
         for key, meta_name in meta_mappings.items():
-            meta_tag = self.soup.find("meta", attrs={"name": meta_name})
+            meta_tag = self._meta_by_name.get(meta_name)
             if meta_tag and meta_tag.get("content"):
                 metadata[key] = meta_tag["content"].strip()
 
         # Extract authors
-        authors = []
-        author_tags = self.soup.find_all("meta", attrs={"name": "citation_author"})
-        for tag in author_tags:
-            if tag.get("content"):
-                authors.append(tag["content"].strip())
-        metadata["authors"] = authors
+        metadata["authors"] = list(self._authors)
 
         # Extract title from page title if not found in meta
         if "title" not in metadata:
-            title_tag = self.soup.find("title")
+            title_tag = self._title_tag
             if title_tag:
                 title = title_tag.get_text().strip()
                 # Remove " - PMC" suffix if present
-                title = re.sub(r"\s*-\s*PMC\s*$", "", title)
+                title = _TITLE_SUFFIX_RE.sub("", title)
                 metadata["title"] = title
 
         metadata["pmcid"] = self._extract_pmcid()
@@ -180,12 +365,12 @@ class PubMedHTMLToMarkdownConverter:
 
     def _is_scanned_document(self) -> bool:
         """Check if this is a scanned document (legacy format)."""
-        scanned_indicators = [
-            self.soup.find("section", class_="scanned-pages"),
-            self.soup.find("meta", attrs={"name": "ncbi_type", "content": "scanpage"}),
-            self.soup.find("figure", class_="fig-scanned"),
-        ]
-        return any(indicator is not None for indicator in scanned_indicators)
+        # Stop at the first indicator found instead of always running all three searches
+        return bool(
+            "scanned-pages" in self._sections_by_class
+            or self._has_scanpage_meta
+            or self._has_scanned_figure
+        )
 
     def _handle_scanned_document(self) -> str:
         """Handle scanned documents with limited structured content."""
@@ -201,7 +386,7 @@ class PubMedHTMLToMarkdownConverter:
             lines.append(abstract)
 
         # Add scanned page images
-        scanned_section = self.soup.find("section", class_="scanned-pages")
+        scanned_section = self._sections_by_class.get("scanned-pages")
         if scanned_section:
             lines.append("## Full Text (Scanned Pages)")
             lines.append("")
@@ -219,7 +404,7 @@ class PubMedHTMLToMarkdownConverter:
 
     def _extract_abstract(self) -> str:
         """Extract abstract section."""
-        abstract_section = self.soup.find("section", class_="abstract")
+        abstract_section = self._sections_by_class.get("abstract")
         if not abstract_section:
             return ""
 
@@ -229,20 +414,19 @@ class PubMedHTMLToMarkdownConverter:
         subsections = abstract_section.find_all(["h3", "h4"], class_="pmc_sec_title")
         if subsections:
             current_section = None
-            for element in abstract_section.descendants:
-                if isinstance(element, Tag):
-                    if element.name in ["h3", "h4"] and "pmc_sec_title" in element.get(
-                        "class", []
-                    ):
+            # Only headings and paragraphs matter, so skip text nodes and other tags
+            for element in abstract_section.find_all(["h3", "h4", "p"]):
+                if element.name != "p":
+                    if "pmc_sec_title" in element.get("class", []):
                         current_section = element.get_text().strip()
                         # Remove trailing colon if present to avoid double colons
                         current_section = current_section.rstrip(":")
                         lines.append(f"**{current_section}:** ")
-                    elif element.name == "p" and current_section:
-                        text = self._clean_text(element.get_text())
-                        if text:
-                            lines.append(text)
-                            lines.append("")
+                elif current_section:
+                    text = self._clean_text(element.get_text())
+                    if text:
+                        lines.append(text)
+                        lines.append("")
         else:
             # Simple abstract without subsections
             paragraphs = abstract_section.find_all("p")
@@ -256,7 +440,7 @@ class PubMedHTMLToMarkdownConverter:
 
     def _extract_main_content(self) -> str:
         """Extract main article content sections."""
-        main_body = self.soup.find("section", class_="main-article-body")
+        main_body = self._sections_by_class.get("main-article-body")
         if not main_body:
             return ""
 
@@ -267,24 +451,19 @@ class PubMedHTMLToMarkdownConverter:
 
         for section in sections:
             # Skip abstract (already handled), references (handled separately), and keywords (part of abstract)
-            if any(
-                cls in section.get("class", [])
-                for cls in ["abstract", "ref-list", "kwd-group"]
-            ):
+            if _SKIP_CLASSES.intersection(section.get("class") or ()):
                 continue
 
-            section_content = self._process_section(section)
-            if section_content:
-                lines.append(section_content)
+            self._process_section(section, lines)
 
         return "\n".join(lines)
 
-    def _process_section(self, section: Tag) -> str:
-        """Process a single content section."""
-        lines = []
+    def _process_section(self, section: Tag, lines: List[str]) -> None:
+        """Process a single content section, appending its lines to `lines`."""
+        start = len(lines)
 
         # Extract section title
-        title_tag = section.find(["h1", "h2", "h3", "h4"], class_="pmc_sec_title")
+        title_tag = _find_section_title(section)
         if title_tag:
             title = self._clean_text(title_tag.get_text())
             level = int(title_tag.name[1])  # h2 -> 2, h3 -> 3, etc.
@@ -302,79 +481,30 @@ class PubMedHTMLToMarkdownConverter:
                         lines.append("")
                 elif element.name == "section" and element.get("class"):
                     # Handle subsections, tables, figures
-                    if "tw" in element.get("class", []):  # Table
-                        table_md = self._process_table(element)
-                        if table_md:
-                            lines.append(table_md)
-                    elif any(
-                        cls in element.get("class", []) for cls in ["fig", "figure"]
-                    ):  # Figure
-                        figure_md = self._process_figure(element)
-                        if figure_md:
-                            lines.append(figure_md)
+                    element_classes = frozenset(element["class"])
+                    if "tw" in element_classes:  # Table
+                        self._process_table(element, lines)
+                    elif element_classes & _FIG_CLASSES:  # Figure
+                        self._process_figure(element, lines)
                     else:  # Subsection
-                        subsection_md = self._process_section(element)
-                        if subsection_md:
-                            lines.append(subsection_md)
+                        self._process_section(element, lines)
                 elif element.name == "figure":
-                    figure_md = self._process_figure(element)
-                    if figure_md:
-                        lines.append(figure_md)
+                    self._process_figure(element, lines)
                 elif element.name == "table":
                     # Handle direct table elements
                     table_md = self._convert_table_to_markdown(element)
                     if table_md:
                         lines.append(table_md)
 
-        return "\n".join(lines)
+        _drop_blank_block(lines, start)
 
     def _process_paragraph(self, p_tag: Tag) -> str:
         """Process paragraph with inline formatting and citations."""
-        text = ""
-
-        def process_element(element):
-            """Process a single element and return its markdown representation."""
-            if isinstance(element, NavigableString):
-                return str(element)
-            elif isinstance(element, Tag):
-                if element.name == "em" or element.name == "i":
-                    return f"*{element.get_text()}*"
-                elif element.name == "strong" or element.name == "b":
-                    return f"**{element.get_text()}**"
-                elif element.name == "sub":
-                    return f"_{element.get_text()}_"
-                elif element.name == "sup":
-                    return f"^{element.get_text()}^"
-                elif element.name == "a":
-                    # Handle citations and cross-references
-                    link_text = element.get_text().strip()
-                    href = element.get("href", "")
-
-                    if href.startswith("#"):
-                        # Internal reference
-                        return f"[{link_text}]({href})"
-                    elif href:
-                        # External link
-                        return f"[{link_text}]({href})"
-                    else:
-                        return link_text
-                else:
-                    # For any other tag, recursively process its contents
-                    result = ""
-                    for child in element.contents:
-                        result += process_element(child)
-                    return result
-            return ""
+        return self._clean_text(_inline_markdown(p_tag))
 
-        # Process all direct contents of the paragraph
-        for element in p_tag.contents:
-            text += process_element(element)
-
-        return self._clean_text(text)
-
-    def _process_table(self, table_section: Tag) -> str:
-        """Process table section."""
-        lines = []
+    def _process_table(self, table_section: Tag, lines: List[str]) -> None:
+        """Process table section, appending its lines to `lines`."""
+        start = len(lines)
 
         # Extract table title
         title_tag = table_section.find(["h3", "h4"], class_="obj_head")
@@ -403,7 +533,7 @@ class PubMedHTMLToMarkdownConverter:
             table_number = ""
             if title:
                 # Try to extract table number from title like "Table 1." or "Table 1:"
-                match = re.search(r"Table\s+(\d+)", title, re.IGNORECASE)
+                match = _TABLE_NUM_RE.search(title)
                 if match:
                     table_number = match.group(1)
 
@@ -415,36 +545,32 @@ class PubMedHTMLToMarkdownConverter:
                 lines.append(f"Table Caption: {caption}")
             lines.append("")
 
-        return "\n".join(lines)
+        _drop_blank_block(lines, start)
+
+    def _table_row_cells(self, cells: List[Tag]) -> List[str]:
+        """Convert a row's cells to escaped markdown cell text, padding for colspan."""
+        row_data = []
+        for cell in cells:
+            # Handle colspan (markdown doesn't support rowspan)
+            colspan = int(cell.get("colspan", 1))
+            # Escape pipe characters and drop newlines in a single pass
+            text = self._clean_text(cell.get_text()).translate(_CELL_TRANS)
+            # Handle empty cells
+            if not text:
+                text = " "
+            row_data.append(text)
+            # Add empty cells for colspan > 1
+            if colspan > 1:
+                row_data.extend([""] * (colspan - 1))
+        return row_data
 
     def _convert_table_to_markdown(self, table_tag: Tag) -> str:
         """Convert HTML table to markdown table."""
-        rows = []
-        max_cols = 0
-
         # Process header
         thead = table_tag.find("thead")
         header_rows = []
         if thead:
             header_rows = thead.find_all("tr")
-            for row in header_rows:
-                cells = row.find_all(["th", "td"])
-                row_data = []
-                for cell in cells:
-                    # Handle colspan
-                    colspan = int(cell.get("colspan", 1))
-                    text = self._clean_text(cell.get_text()).strip()
-                    # Escape pipe characters and clean up text
-                    text = text.replace("|", "\\|").replace("\n", " ")
-                    # Handle empty cells
-                    if not text:
-                        text = " "
-                    row_data.append(text)
-                    # Add empty cells for colspan > 1
-                    for _ in range(colspan - 1):
-                        row_data.append("")
-                rows.append(row_data)
-                max_cols = max(max_cols, len(row_data))
 
         # Process body
         tbody = table_tag.find("tbody")
@@ -457,84 +583,58 @@ class PubMedHTMLToMarkdownConverter:
                 # Remove header rows if we already processed them
                 body_rows = body_rows[len(header_rows) :]
 
-        for row in body_rows:
-            cells = row.find_all(["td", "th"])
-            row_data = []
-            for cell in cells:
-                # Handle colspan (markdown doesn't support rowspan)
-                colspan = int(cell.get("colspan", 1))
-                text = self._clean_text(cell.get_text()).strip()
-                # Escape pipe characters and clean up text
-                text = text.replace("|", "\\|").replace("\n", " ")
-                # Handle empty cells
-                if not text:
-                    text = " "
-                row_data.append(text)
-                # Add empty cells for colspan > 1
-                for _ in range(colspan - 1):
-                    row_data.append("")
+        # Most tables are regular, so each row is formatted as soon as it is
+        # read; only a ragged table needs a second pass to pad its rows
+        rows = []
+        row_lines = []
+        ragged = False
+        for row in list(header_rows) + list(body_rows):
+            row_data = self._table_row_cells(row.find_all(["th", "td"]))
             rows.append(row_data)
-            max_cols = max(max_cols, len(row_data))
+            if ragged:
+                continue
+            if len(row_data) != len(rows[0]):
+                ragged = True
+            else:
+                row_lines.append("| " + " | ".join(row_data) + " |")
 
         if not rows:
             return ""
 
-        # Normalize all rows to have same number of columns
-        for row in rows:
-            while len(row) < max_cols:
-                row.append("")
-
-        # Convert to markdown
-        lines = []
-
-        if rows:
-            # Determine if we have proper headers
-            has_proper_header = thead and header_rows
+        max_cols = len(rows[0])
+        if ragged:
+            # Normalize all rows to have same number of columns
+            max_cols = max(len(row_data) for row_data in rows)
+            row_lines = [
+                "| " + " | ".join(row_data + [""] * (max_cols - len(row_data))) + " |"
+                for row_data in rows
+            ]
+
+        # Determine if we have proper headers
+        has_proper_header = thead and header_rows
+
+        # For tables without proper headers, use first row if it looks like headers
+        # (contains non-numeric text). Otherwise create generic headers
+        if has_proper_header or any(
+            not cell.replace(".", "").replace("-", "").isdigit() and cell.strip()
+            for cell in rows[0]
+        ):
+            header_line = row_lines[0]
+            data_lines = row_lines[1:]
+        else:
+            # Create descriptive headers based on content patterns
+            header = ["Category"] + [f"Value {i}" for i in range(1, max_cols)]
+            header_line = "| " + " | ".join(header[:max_cols]) + " |"
+            data_lines = row_lines
 
-            if has_proper_header:
-                header = rows[0]
-                data_rows = rows[1:]
-            else:
-                # For tables without proper headers, use first row if it looks like headers
-                # Otherwise create generic headers
-                first_row = rows[0]
-                # Check if first row looks like headers (contains non-numeric text)
-                if any(
-                    not cell.replace(".", "").replace("-", "").isdigit()
-                    and cell.strip()
-                    for cell in first_row
-                ):
-                    header = first_row
-                    data_rows = rows[1:]
-                else:
-                    # Create descriptive headers based on content patterns
-                    header = []
-                    for i in range(max_cols):
-                        if i == 0:
-                            header.append("Category")
-                        else:
-                            header.append(f"Value {i}")
-                    data_rows = rows
-
-            # Header row
-            lines.append("| " + " | ".join(header) + " |")
-
-            # Separator row - use consistent width for better formatting
-            separator_cols = ["---"] * len(header)
-            lines.append("| " + " | ".join(separator_cols) + " |")
-
-            # Data rows
-            for row in data_rows:
-                # Ensure row has same length as header
-                while len(row) < len(header):
-                    row.append("")
-                lines.append("| " + " | ".join(row[: len(header)]) + " |")
+        # Separator row - use consistent width for better formatting
+        separator_line = "| " + " | ".join(["---"] * max_cols) + " |"
 
-        return "\n".join(lines)
+        return "\n".join([header_line, separator_line] + data_lines)
 
-    def _process_figure(self, figure_tag: Tag) -> str:
-        """Process figure element."""
-        lines = []
+    def _process_figure(self, figure_tag: Tag, lines: List[str]) -> None:
+        """Process figure element, appending its lines to `lines`."""
+        start = len(lines)
 
         # Extract figure title
         title_tag = figure_tag.find(["h3", "h4"], class_="obj_head")
@@ -571,11 +671,11 @@ class PubMedHTMLToMarkdownConverter:
             lines.append(caption)
             lines.append("")
 
-        return "\n".join(lines)
+        _drop_blank_block(lines, start)
 
     def _extract_references(self) -> str:
         """Extract references section."""
-        ref_section = self.soup.find("section", class_="ref-list")
+        ref_section = self._sections_by_class.get("ref-list")
         if not ref_section:
             return ""
 
@@ -636,26 +736,22 @@ class PubMedHTMLToMarkdownConverter:
 
         return " ".join(parts)
 
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize text."""
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """
+        Clean and normalize text. Short strings (table cells, author names,
+        column labels) repeat often within and across documents, so they are memoized.
+        """
         if not text:
             return ""
-
-        # Decode HTML entities
-        text = html.unescape(text)
-
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text)
-
-        # Remove extra whitespace
-        text = text.strip()
-
-        return text
+        if len(text) > _CLEAN_TEXT_CACHE_MAX_LEN:
+            return _clean_text_nocache(text)
+        return _clean_text_cached(text)
 
     def _clean_markdown(self, markdown: str) -> str:
         """Clean up final markdown output."""
         # Remove excessive blank lines
-        markdown = re.sub(r"\n{3,}", "\n\n", markdown)
+        markdown = _BLANK_LINES_RE.sub("\n\n", markdown)
 
         # Ensure document ends with single newline
         markdown = markdown.strip() + "\n"
@@ -663,6 +759,25 @@ class PubMedHTMLToMarkdownConverter:
         return markdown
 
 
+@functools.lru_cache(maxsize=1)
+def _get_converter() -> PubMedHTMLToMarkdownConverter:
+    """Get the converter owned by the current process."""
+    return PubMedHTMLToMarkdownConverter()
+
+
+def convert_html_worker(html_content: str) -> str:
+    """
+    Convert HTML content to markdown with a converter created once per process.
+    Module-level so it can be submitted to a ProcessPoolExecutor.
+
+    Args:
+        html_content (str): The HTML content to convert
+    Returns:
+        str: The markdown content
+    """
+    return _get_converter().convert_html(html_content)
+
+
 def main():
     """Example usage of the converter."""
     import sys
@@ -691,17 +806,27 @@ def main():
         sys.exit(1)
 
 
+def _convert_one(file: str) -> None:
+    """Convert data/html/{file} to data/markdown. Module-level so Pool workers can run it."""
+    markdown_content = _get_converter().convert_file(f"data/html/{file}")
+    # Encode once and hand the file a single bytes object to write
+    with open(f"data/markdown/{file.replace('.html', '.md')}", "wb") as f:
+        f.write(markdown_content.encode("utf-8"))
+
+
 def run_local():
-    converter = PubMedHTMLToMarkdownConverter()
     input_files = os.listdir("data/html")
-    for file in tqdm.tqdm(input_files, desc="Converting HTML to Markdown"):
-        converter = PubMedHTMLToMarkdownConverter()
-        markdown_content = converter.convert_file(f"data/html/{file}")
-        os.makedirs("data/markdown", exist_ok=True)
-        with open(
-            f"data/markdown/{file.replace('.html', '.md')}", "w", encoding="utf-8"
-        ) as f:
-            f.write(markdown_content)
+    os.makedirs("data/markdown", exist_ok=True)
+    # Each file converts independently and is CPU-bound, so spread them over all cores
+    # The converter only holds per-document state that convert_html resets,
+    # so each worker creates one up front and reuses it for every file
+    with multiprocessing.Pool(os.cpu_count(), initializer=_get_converter) as pool:
+        for _ in tqdm.tqdm(
+            pool.imap_unordered(_convert_one, input_files, chunksize=8),
+            total=len(input_files),
+            desc="Converting HTML to Markdown",
+        ):
+            pass
     logger.info(f"Converted {len(input_files)} HTML files to Markdown")
 
 
@@ -1,12 +1,19 @@
 import os
 import requests
 import zipfile
-from io import BytesIO
+import tempfile
 import shutil
 from loguru import logger
+import numpy as np
 import pandas as pd
 import json
 
+try:
+    # Optional: scans the TSV lazily and dedupes PMIDs in parallel
+    import polars as pl
+except ImportError:
+    pl = None
+
 """
 This file contains functions to load the clinical variants data from the PharmGKB API.
 The key function is get_pmid_list(), which loads the PMIDs from the variant annotations tsv file and saves them to a json file.
@@ -37,12 +44,18 @@ def download_and_extract_variant_annotations(
     os.makedirs(extract_dir, exist_ok=True)
 
     logger.info(f"Downloading ZIP from {url}...")
-    response = requests.get(url)
-    response.raise_for_status()
-
-    logger.info("Extracting ZIP...")
-    with zipfile.ZipFile(BytesIO(response.content)) as z:
-        z.extractall(extract_dir)
+    # Stream to a spooled file instead of holding the whole body in memory;
+    # anything past 64 MB spills to disk
+    with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as tmp:
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, tmp, length=1024 * 1024)
+
+        logger.info("Extracting ZIP...")
+        tmp.seek(0)
+        with zipfile.ZipFile(tmp) as z:
+            z.extractall(extract_dir)
 
     logger.info(f"Files extracted to: {extract_dir}")
     return extract_dir
@@ -76,6 +89,51 @@ def load_raw_variant_annotations(
     return df
 
 
+def _variant_annotations_tsv(override: bool, save_dir: str) -> str:
+    """Return the path to var_drug_ann.tsv, downloading it first if missing."""
+    tsv_path = os.path.join(save_dir, "variantAnnotations", "var_drug_ann.tsv")
+
+    if not os.path.exists(tsv_path):
+        logger.info(f"{tsv_path} not found. Downloading data...")
+        download_and_extract_variant_annotations(override, save_dir)
+
+    if not os.path.exists(tsv_path):
+        logger.error(f"File still not found after download attempt: {tsv_path}")
+        raise FileNotFoundError(
+            f"File still not found after download attempt: {tsv_path}"
+        )
+    return tsv_path
+
+
+def _unique_pmids_polars(override: bool, save_dir: str) -> list:
+    """Unique PMIDs in first-seen order, read and deduplicated by polars."""
+    tsv_path = _variant_annotations_tsv(override, save_dir)
+    logger.info(f"Scanning PMID column with polars from: {tsv_path}")
+    return (
+        pl.scan_csv(tsv_path, separator="\t", has_header=True)
+        .select(pl.col("PMID").cast(pl.Int64).drop_nulls().unique(maintain_order=True))
+        .collect()
+        .to_series()
+        .to_list()
+    )
+
+
+def load_pmid_column(override: bool = False, save_dir: str = "data") -> pd.Series:
+    """
+    Loads only the PMID column of the variant annotations tsv file.
+    Skips type inference and string allocation for every other column, which
+    load_raw_variant_annotations pays for.
+    Params:
+        override (bool): If True, the file will be downloaded and extracted again.
+    Returns:
+        pd.Series: The PMID column as nullable integers.
+    """
+    tsv_path = _variant_annotations_tsv(override, save_dir)
+    logger.info(f"Loading PMID column from: {tsv_path}")
+    df = pd.read_csv(tsv_path, sep="\t", usecols=["PMID"], dtype={"PMID": "Int64"})
+    return df["PMID"]
+
+
 def unique_variants(df: pd.DataFrame) -> dict:
     """
     Generates a dictionary with unique values for each column of a Pandas DataFrame.
@@ -91,24 +149,49 @@ def unique_variants(df: pd.DataFrame) -> dict:
         logger.error("Input is not a Pandas DataFrame")
         return {}
 
-    return {col: df[col].unique().tolist() for col in df.columns}
+    return {col: series.drop_duplicates().to_list() for col, series in df.items()}
+
+
+def _is_fresh(path: str, *sources: str) -> bool:
+    """True if path exists and is no older than any of the sources that do exist."""
+    if not os.path.exists(path):
+        return False
+    mtime = os.path.getmtime(path)
+    return all(
+        mtime >= os.path.getmtime(source)
+        for source in sources
+        if os.path.exists(source)
+    )
 
 
 def get_pmid_list(override: bool = False, save_dir: str = "data") -> list:
     """
     Loads the pmid list from the variant annotations tsv file.
+    The list is cached as raw int64s in pharmgkb_pmids.bin, with a one-per-line
+    pharmgkb_pmids.txt copy kept alongside for other tools. The .bin is ignored
+    when override is set or when the .txt or the TSV is newer than it.
     """
+    pmid_bin_path = os.path.join(save_dir, "pharmgkb_pmids.bin")
     pmid_list_path = os.path.join(save_dir, "pharmgkb_pmids.txt")
+    tsv_path = os.path.join(save_dir, "variantAnnotations", "var_drug_ann.tsv")
+    if not override and _is_fresh(pmid_bin_path, pmid_list_path, tsv_path):
+        logger.info(f"Loading PMIDs from {pmid_bin_path}")
+        return np.fromfile(pmid_bin_path, dtype=np.int64).tolist()
+
     if os.path.exists(pmid_list_path):
         logger.info(f"Loading PMIDs from {pmid_list_path}")
         with open(pmid_list_path, "r") as f:
             pmid_list = [int(line.strip()) for line in f.readlines()]
     else:
-        df = load_raw_variant_annotations(override)
-        pmid_list = df["PMID"].unique().tolist()
+        if pl is not None:
+            pmid_list = _unique_pmids_polars(override, save_dir)
+        else:
+            pmids = load_pmid_column(override, save_dir)
+            pmid_list = pmids.dropna().unique().tolist()
         logger.info(f"Saving PMIDs to {pmid_list_path}")
         with open(pmid_list_path, "w") as f:
             f.write("\n".join(str(pmid) for pmid in pmid_list))
+    np.asarray(pmid_list, dtype=np.int64).tofile(pmid_bin_path)
     return pmid_list
 
 
@@ -1,72 +1,318 @@
-import requests
-from typing import List, Dict, Optional, Union
+import asyncio
+import httpx
+from typing import List, Dict, Optional, Tuple, Union
 import os
+import orjson
+import sqlite3
+import threading
 import time
-import json
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 from tqdm import tqdm
 from dotenv import load_dotenv
 from loguru import logger
 
+from ._async_utils import RateLimiter, retry_after_seconds, run_sync
+
 load_dotenv()
 
 
+@lru_cache(maxsize=1)
 def _get_cache_file_path() -> Path:
-    """Get the cache file path from environment or default."""
+    """
+    Get the cache file path from environment or default. Memoized so the env
+    lookups and mkdir run once; call cache_clear() after removing the directory.
+    """
     cache_dir = os.getenv("PMID_CACHE_DIR", "data/cache")
-    cache_file = os.getenv("PMID_CACHE_FILE", "pmid_to_pmcid.json")
+    cache_file = os.getenv("PMID_CACHE_FILE", "pmid_to_pmcid.sqlite")
     cache_path = Path(cache_dir) / cache_file
+    if cache_path.suffix == ".json":
+        # Settings from before the SQLite cache; the JSON file is imported on first use
+        sqlite_path = cache_path.with_suffix(".sqlite")
+        logger.warning(
+            f"PMID_CACHE_FILE points at the old JSON cache {cache_path}; "
+            f"using {sqlite_path} instead (update PMID_CACHE_FILE to silence this)"
+        )
+        cache_path = sqlite_path
     cache_path.parent.mkdir(parents=True, exist_ok=True)
     return cache_path
 
 
-def _load_cache() -> Dict[str, Dict]:
-    """Load existing cache from file."""
-    cache_path = _get_cache_file_path()
-    if not cache_path.exists():
-        return {}
+# SQLite caps the number of bound parameters per statement
+_SQLITE_MAX_PARAMS = 500
 
+# Cache entries carry an age_class that sets their lifetime:
+# - "old_pmid": PMIDs below OLD_PMID_THRESHOLD (PMIDs are assigned in increasing
+#   order, so roughly pre-2019). A miss for these rarely turns into a PMC
+#   release later, so negative results are kept for NEGATIVE_EXPIRY_DAYS.
+# - "recent_pmid": newer PMIDs, which do gain PMCIDs; cache_expiry_days applies.
+# - "failed": the lookup errored, so retry after FAILED_EXPIRY_DAYS.
+OLD_PMID_THRESHOLD = 30_000_000
+NEGATIVE_EXPIRY_DAYS = 365
+FAILED_EXPIRY_DAYS = 1
+
+
+# Each database is set up once per path (per _reset_cache()), then every thread
+# keeps its own connection, so reads and writes skip the schema checks
+_cache_lock = threading.Lock()
+_cache_generation = 0
+_ready_caches = set()
+_thread_local = threading.local()
+
+
+def _init_cache_db(cache_path: Path) -> None:
+    """
+    Create or migrate the cache table. A JSON cache left by earlier versions
+    next to the database is imported when the database is new.
+    """
+    is_new = not cache_path.exists()
+    with closing(sqlite3.connect(cache_path, timeout=30)) as conn:
+        # WAL lets readers (e.g. the API's executor threads) proceed during writes;
+        # the mode is stored in the database file, so later connections inherit it
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(pmid TEXT PRIMARY KEY, pmcid TEXT, timestamp TEXT, age_class TEXT, ts INTEGER)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+        # Databases created before these columns existed
+        for column, column_type in (("age_class", "TEXT"), ("ts", "INTEGER")):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE cache ADD COLUMN {column} {column_type}")
+        legacy_path = cache_path.with_suffix(".json")
+        if is_new and legacy_path.exists():
+            try:
+                with open(legacy_path, "rb") as f:
+                    legacy = orjson.loads(f.read())
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO cache (pmid, pmcid, timestamp) VALUES (?, ?, ?)",
+                        (
+                            (str(k).strip(), v.get("pmcid"), v.get("timestamp"))
+                            for k, v in legacy.items()
+                        ),
+                    )
+                logger.info(f"Imported {len(legacy)} entries from {legacy_path}")
+            except (orjson.JSONDecodeError, IOError, AttributeError) as e:
+                logger.warning(f"Failed to import legacy cache file {legacy_path}: {e}")
+
+
+def _connect_cache(cache_path: Path) -> sqlite3.Connection:
+    """Return this thread's connection to the cache database, setting it up on first use."""
+    key = (os.getpid(), _cache_generation)
+    conns = getattr(_thread_local, "conns", None)
+    if conns is None or _thread_local.key != key:
+        # First use on this thread, or the cache was reset, or this is a forked child
+        if conns is not None and _thread_local.key[0] == key[0]:
+            for conn in conns.values():
+                conn.close()
+        conns = _thread_local.conns = {}
+        _thread_local.key = key
+
+    conn = conns.get(cache_path)
+    if conn is None:
+        with _cache_lock:
+            if (cache_path, key[1]) not in _ready_caches:
+                _init_cache_db(cache_path)
+                _ready_caches.add((cache_path, key[1]))
+        conn = conns[cache_path] = sqlite3.connect(cache_path, timeout=30)
+    return conn
+
+
+def _reset_cache() -> None:
+    """Forget the set-up databases (e.g. after deleting them); connections reopen on next use."""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _ready_caches.clear()
+
+
+def _load_cache(pmids: List[str]) -> Dict[str, Dict]:
+    """Load the cache entries for the given PMIDs."""
+    cache_path = _get_cache_file_path()
+    cache = {}
     try:
-        with open(cache_path, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        conn = _connect_cache(cache_path)
+        for i in range(0, len(pmids), _SQLITE_MAX_PARAMS):
+            chunk = pmids[i : i + _SQLITE_MAX_PARAMS]
+            rows = conn.execute(
+                "SELECT pmid, pmcid, timestamp, age_class, ts FROM cache WHERE pmid IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for pmid, pmcid, timestamp, age_class, ts in rows:
+                cache[pmid] = {
+                    "pmcid": pmcid,
+                    "timestamp": timestamp,
+                    "age_class": age_class,
+                    "ts": ts,
+                }
+    except sqlite3.Error as e:
         logger.warning(f"Failed to load cache file {cache_path}: {e}")
-        return {}
+    return cache
 
 
-def _save_cache(cache: Dict[str, Dict]) -> None:
-    """Save cache to file."""
+def _save_cache(entries: Dict[str, Dict]) -> None:
+    """Write new entries to the cache in a single transaction."""
     cache_path = _get_cache_file_path()
     try:
-        with open(cache_path, "w") as f:
-            json.dump(cache, f, indent=2)
-    except IOError as e:
+        conn = _connect_cache(cache_path)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (pmid, pmcid, timestamp, age_class, ts) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        pmid,
+                        entry.get("pmcid"),
+                        entry.get("timestamp"),
+                        entry.get("age_class"),
+                        entry.get("ts"),
+                    )
+                    for pmid, entry in entries.items()
+                ),
+            )
+    except sqlite3.Error as e:
         logger.error(f"Failed to save cache to {cache_path}: {e}")
 
 
+def _pmid_age_class(pmid: str) -> str:
+    """Classify a PMID as "old_pmid" or "recent_pmid" by its number."""
+    if pmid.isdigit() and int(pmid) < OLD_PMID_THRESHOLD:
+        return "old_pmid"
+    return "recent_pmid"
+
+
+def _cache_entry(
+    pmid: str, pmcid: Optional[str], now: datetime, failed: bool = False
+) -> Dict:
+    """
+    Build a cache entry, tagging it with the age_class that sets its lifetime.
+    The human-readable timestamp is kept next to epoch seconds (ts), which is
+    what validity checks compare against.
+    """
+    age_class = "failed" if failed else _pmid_age_class(pmid)
+    return {
+        "pmcid": pmcid,
+        "timestamp": now.isoformat(),
+        "age_class": age_class,
+        "ts": int(now.timestamp()),
+    }
+
+
 def _is_cache_entry_valid(entry: Dict, expiry_days: int = 30) -> bool:
-    """Check if a cache entry is still valid."""
+    """Check if a cache entry is still valid, adjusting expiry_days by its age_class."""
+    age_class = entry.get("age_class")
+    if age_class == "failed":
+        expiry_days = min(expiry_days, FAILED_EXPIRY_DAYS)
+    elif age_class == "old_pmid" and not entry.get("pmcid"):
+        expiry_days = max(expiry_days, NEGATIVE_EXPIRY_DAYS)
+
+    ts = entry.get("ts")
+    if isinstance(ts, int):
+        return time.time() - ts < expiry_days * 86400
+
+    # Entries written before ts existed only have the ISO timestamp
     if "timestamp" not in entry:
         return False
-
     try:
         cached_time = datetime.fromisoformat(entry["timestamp"])
         expiry_time = cached_time + timedelta(days=expiry_days)
         return datetime.now() < expiry_time
-    except (ValueError, KeyError):
+    except (ValueError, KeyError, TypeError):
         return False
 
 
+# NCBI E-utilities allow 3 requests/sec, or 10 with an API key
+DEFAULT_RPS = 3
+API_KEY_RPS = 10
+# How many times a batch is retried after a 429 before giving up
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+async def _fetch_batch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    limiter: RateLimiter,
+    url: str,
+    params: Dict[str, str],
+) -> Tuple[Optional[List[Dict]], Optional[Exception]]:
+    """
+    Fetch one batch of ID Converter records, backing off on 429 responses.
+
+    Returns:
+        (records, error): exactly one of the two is None
+    """
+    async with semaphore:
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await limiter.wait()
+            try:
+                response = await client.get(url, params=params)
+                if response.status_code == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                    retry_after = retry_after_seconds(response)
+                    logger.warning(f"Rate limited by NCBI, retrying in {retry_after:.1f}s")
+                    limiter.back_off(retry_after)
+                    continue
+                response.raise_for_status()
+                return orjson.loads(response.content).get("records", []), None
+            except Exception as e:
+                return None, e
+
+
+async def _fetch_batches(
+    url: str,
+    base_params: Dict[str, str],
+    batches: List[List[str]],
+    delay: float,
+    max_concurrency: int,
+) -> List[Tuple[Optional[List[Dict]], Optional[Exception]]]:
+    """
+    Fetch all batches concurrently, in input order: at most `max_concurrency`
+    in flight, and request starts spaced at least `delay` seconds apart.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(delay)
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_connections=max_concurrency),
+    ) as client:
+        with tqdm(
+            total=len(batches), desc="Converting PMIDs to PMCIDs", unit="batch"
+        ) as progress:
+
+            async def fetch(batch: List[str]):
+                params = {**base_params, "ids": ",".join(batch)}
+                result = await _fetch_batch(client, semaphore, limiter, url, params)
+                progress.update(1)
+                return result
+
+            return await asyncio.gather(*(fetch(batch) for batch in batches))
+
+
+def _sample_pmcids(results: Dict[str, Optional[str]], size: int = 5) -> str:
+    """Up to `size` distinct PMCIDs for logging, stopping as soon as they are found."""
+    sample = {}
+    for pmcid in results.values():
+        if pmcid is not None:
+            sample[pmcid] = None
+            if len(sample) == size:
+                break
+    return ", ".join(str(pmcid) for pmcid in sample)
+
+
 def get_pmcid_from_pmid(
     pmids: Union[List[str], str],
     email: str = os.getenv("NCBI_EMAIL"),
     batch_size: int = 200,
-    delay: float = 0.4,
+    delay: Optional[float] = None,
     use_cache: bool = True,
     cache_expiry_days: int = 30,
     save_dir: str = "data",
     override: bool = False,
+    max_concurrency: Optional[int] = None,
+    api_key: Optional[str] = os.getenv("NCBI_API_KEY"),
 ) -> Dict[str, Optional[str]]:
     """
     Convert a list of PMIDs to PMCIDs using NCBI's ID Converter API.
@@ -75,9 +321,16 @@ def get_pmcid_from_pmid(
         pmids: List of PMIDs (as strings) or a single PMID (as a string).
         email: Your email address for NCBI tool identification.
         batch_size: Number of PMIDs to send per request (max: 200).
-        delay: Seconds to wait between requests (default 0.4 to respect NCBI).
+        delay: Minimum seconds between request starts. Defaults to NCBI's limit:
+            1/10 s with an API key, otherwise 1/3 s.
         use_cache: Whether to use cached results (default: True).
         cache_expiry_days: Days after which cache entries expire (default: 30).
+            Misses for old PMIDs are kept for NEGATIVE_EXPIRY_DAYS instead, and
+            failed lookups for FAILED_EXPIRY_DAYS.
+        max_concurrency: Number of batches requested concurrently
+            (default: 10 with an API key, otherwise 3).
+        api_key: NCBI API key, sent with each request to lift the rate limit
+            (default: the NCBI_API_KEY environment variable).
 
     Returns:
         Dict mapping each PMID to a PMCID (or None if not available).
@@ -94,18 +347,14 @@ def get_pmcid_from_pmid(
         pmids = [pmids]
     else:
         pmids = [str(pmid) for pmid in pmids]
-    # Normalize: strip whitespace from all PMIDs for consistent keying
-    pmids = [p.strip() for p in pmids]
+    # Normalize: strip whitespace from all PMIDs for consistent keying, and drop
+    # duplicates (keeping first-seen order) so each PMID is looked up once
+    pmids = list(dict.fromkeys(p.strip() for p in pmids))
 
     # Load cache and filter out already cached PMIDs
-    cache = _load_cache() if use_cache else {}
-    # Normalize cache keys to stripped strings for consistent lookups
-    if use_cache and cache:
-        try:
-            cache = {str(k).strip(): v for k, v in cache.items()}
-        except Exception:
-            # If normalization fails for any reason, keep original cache
-            pass
+    cache = _load_cache(pmids) if use_cache else {}
+    # New entries are collected here and merged into the shared cache at the end
+    new_entries = {}
     cached_count = 0
     pmids_to_fetch = []
 
@@ -138,77 +387,69 @@ def get_pmcid_from_pmid(
         )
         total_count = len(results)
         missing_count = total_count - valid_count
-        sample = ", ".join([str(p) for p in list({v for v in results.values() if v is not None})[:5]])
         logger.info(
             f"All PMIDs found in cache | Valid PMCIDs: {valid_count} / {total_count} | Missing: {missing_count}"
         )
         if valid_count:
-            logger.debug(f"Sample PMCIDs (cache): {sample}...")
+            logger.debug(f"Sample PMCIDs (cache): {_sample_pmcids(results)}...")
 
     # Process remaining PMIDs
     logger.info(f"Starting conversion of {len(pmids_to_fetch)} PMIDs to PMCIDs")
-    for i in tqdm(
-        range(0, len(pmids_to_fetch), batch_size),
-        desc="Converting PMIDs to PMCIDs",
-        unit="batch",
-    ):
-        batch = pmids_to_fetch[i : i + batch_size]
-        batch_str = [str(pmid) for pmid in batch]
-        ids_str = ",".join(batch_str)
-
-        params = {
-            "tool": "pmid2pmcid_tool",
-            "email": email,
-            "ids": ids_str,
-            "format": "json",
-        }
-
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            records = data.get("records", [])
-
-            # Update cache with new results
-            timestamp = datetime.now().isoformat()
-            for record in records:
-                # Normalize to string keys (strip whitespace) to ensure consistent lookups downstream
-                pmid = (
-                    str(record.get("pmid")).strip() if record.get("pmid") is not None else None
-                )
-                pmcid = record.get("pmcid")
-                if pmid is not None:
-                    results[pmid] = pmcid if pmcid else None
-
-                # Cache the result
-                if use_cache:
-                    if pmid is not None:
-                        cache[pmid] = {"pmcid": pmcid, "timestamp": timestamp}
+    target_rps = API_KEY_RPS if api_key else DEFAULT_RPS
+    if delay is None:
+        delay = 1 / target_rps
+    if max_concurrency is None:
+        max_concurrency = target_rps
+    base_params = {"tool": "pmid2pmcid_tool", "email": email, "format": "json"}
+    if api_key:
+        base_params["api_key"] = api_key
+    batch_starts = range(0, len(pmids_to_fetch), batch_size)
+    batches = [pmids_to_fetch[i : i + batch_size] for i in batch_starts]
+    batch_responses = (
+        run_sync(_fetch_batches(url, base_params, batches, delay, max_concurrency))
+        if batches
+        else []
+    )
 
-            # Handle PMIDs not found in response
-            normalized_records_pmids = [
-                str(r.get("pmid")).strip() for r in records if r.get("pmid") is not None
-            ]
-            for pmid in batch:
-                if pmid not in normalized_records_pmids:
-                    results[pmid] = None
-                    if use_cache:
-                        cache[pmid] = {"pmcid": None, "timestamp": timestamp}
-
-        except Exception as e:
-            logger.error(f"Failed batch starting at index {i}: {e}")
-            timestamp = datetime.now().isoformat()
+    for i, batch, (records, error) in zip(batch_starts, batches, batch_responses):
+        now = datetime.now()
+        if error is not None:
+            logger.error(f"Failed batch starting at index {i}: {error}")
             for pmid in batch:
                 results[pmid] = None
                 # Cache failed lookups to avoid repeated API calls
                 if use_cache:
-                    cache[pmid] = {"pmcid": None, "timestamp": timestamp}
+                    new_entries[pmid] = _cache_entry(pmid, None, now, failed=True)
+            continue
+
+        # Update cache with new results
+        for record in records:
+            # Normalize to string keys (strip whitespace) to ensure consistent lookups downstream
+            pmid = (
+                str(record.get("pmid")).strip() if record.get("pmid") is not None else None
+            )
+            pmcid = record.get("pmcid")
+            if pmid is not None:
+                results[pmid] = pmcid if pmcid else None
+
+            # Cache the result
+            if use_cache:
+                if pmid is not None:
+                    new_entries[pmid] = _cache_entry(pmid, pmcid, now)
 
-        time.sleep(delay)
+        # Handle PMIDs not found in response
+        normalized_records_pmids = {
+            str(r.get("pmid")).strip() for r in records if r.get("pmid") is not None
+        }
+        for pmid in batch:
+            if pmid not in normalized_records_pmids:
+                results[pmid] = None
+                if use_cache:
+                    new_entries[pmid] = _cache_entry(pmid, None, now)
 
     # Save updated cache (if we fetched anything new)
-    if use_cache and pmids_to_fetch:
-        _save_cache(cache)
+    if use_cache and new_entries:
+        _save_cache(new_entries)
 
     # Save results to file (always save, even if all results were served from cache)
     if save_dir is not None:
@@ -219,17 +460,16 @@ def get_pmcid_from_pmid(
         logger.info(f"Saving results to {results_path}")
         # Always write the results file for this run to avoid downstream consumers reading stale files
         # Respect 'override' only for same-path overwrites (timestamp path makes collisions unlikely)
-        with open(results_path, "w") as f:
-            json.dump(results, f, indent=2)
+        with open(results_path, "wb") as f:
+            f.write(orjson.dumps(results))
 
     # Final summary logging with counts and a small sample
     valid_count = sum(1 for v in results.values() if v is not None)
     total_count = len(pmids)
     missing_count = total_count - valid_count
-    sample = ", ".join([str(p) for p in list({v for v in results.values() if v is not None})[:5]])
     logger.info(
         f"Processed {total_count} PMIDs | Valid PMCIDs: {valid_count} | Missing: {missing_count} | Sources: {cached_count} from cache, {len(pmids_to_fetch)} from API"
     )
     if valid_count:
-        logger.debug(f"Sample PMCIDs: {sample}...")
+        logger.debug(f"Sample PMCIDs: {_sample_pmcids(results)}...")
     return results
@@ -1,17 +1,118 @@
+from ._async_utils import run_sync
 from .pmcid_from_pmid import get_pmcid_from_pmid
-from .html_from_pmcid import get_html_from_pmcid
-from .markdown_from_html import PubMedHTMLToMarkdownConverter
+from .html_from_pmcid import get_html_from_pmcid, aget_html_from_pmcid, create_async_client
+from .markdown_from_html import _get_converter
 from .utils_bioc import format_supplement_as_markdown, prefetch_bioc_supplements
-from .abstract_from_pmid import get_abstract_markdown_from_pmid
-from typing import List, Optional
+from .abstract_from_pmid import (
+    get_abstract_markdown_from_pmid,
+    get_abstracts_markdown_from_pmids,
+)
+from typing import Dict, List, Optional, Set
+import asyncio
+import mmap
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from loguru import logger
 from tqdm import tqdm
 import argparse
 from pathlib import Path
 import shutil
 import re
-import time
+
+
+_SUPPLEMENT_HEADING = "## Supplementary Materials"
+_NO_SUPPLEMENT_MARKDOWN = f"{_SUPPLEMENT_HEADING}\n\nNo supplementary materials found."
+# BioC supplement sections carry "### <file>.pdf" headings; HTML-derived ones don't.
+# Both are bytes so they can run directly against an mmap of the file
+_SUPPLEMENT_HEADING_BYTES = _SUPPLEMENT_HEADING.encode()
+_BIOC_PDF_HEADING_RE = re.compile(rb"^###\s+.*\.pdf\s*$", re.MULTILINE)
+
+
+def _write_markdown(md_path: str, markdown: str, supplement: Optional[str]) -> None:
+    """
+    Write an article followed by its supplement section (or the "none found" stub).
+    Writes the pieces one after another rather than concatenating them, so the
+    article text is never copied just to append a suffix.
+    """
+    with open(md_path, "w", buffering=1 << 20) as f:
+        f.write(markdown.rstrip())
+        f.write("\n\n")
+        f.write(supplement or _NO_SUPPLEMENT_MARKDOWN)
+        f.write("\n")
+
+
+def _has_bioc_supplements(md_path: str) -> bool:
+    """
+    Check whether a markdown file already ends in a BioC supplement section.
+    Searches an mmap of the file, so the skip path never reads it into a string.
+    """
+    with open(md_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file, nothing to map
+            return False
+        with mm:
+            # The regex only runs when the cheap substring check has already matched
+            return (
+                mm.find(_SUPPLEMENT_HEADING_BYTES) != -1
+                and _BIOC_PDF_HEADING_RE.search(mm) is not None
+            )
+
+
+def _add_supplement_to_file(md_path: str, overwrite: bool) -> Optional[bool]:
+    """
+    Append BioC supplementary materials to one saved markdown file.
+
+    Args:
+        md_path (str): Path to the markdown file, named after its PMCID
+        overwrite (bool): Whether to replace an existing supplement section
+
+    Returns:
+        Optional[bool]: True if a supplement was written, False if it was skipped
+            because one is already present, None if no supplement was available
+    """
+    pmcid = os.path.basename(md_path).replace(".md", "")
+
+    # Some articles contain an HTML-derived "Supplementary Materials" section
+    # that is not the BioC supplement text we add (often just a link/stub).
+    # Only skip when BioC-style content is already present (e.g., headings
+    # that look like supplementary PDF filenames).
+    if not overwrite and _has_bioc_supplements(md_path):
+        return False
+
+    supplement = format_supplement_as_markdown(pmcid)
+    if not supplement:
+        return None
+
+    # Only files that are actually rewritten get read in full
+    with open(md_path, "r") as f:
+        content = f.read()
+
+    if overwrite:
+        # Remove old supplement section (everything from ## Supplementary Materials onward)
+        idx = content.find(_SUPPLEMENT_HEADING)
+        if idx != -1:
+            content = content[:idx]
+
+    _write_markdown(md_path, content, supplement)
+    return True
+
+
+def _html_file_to_markdown(html_path: str, save_dir: str) -> None:
+    """
+    Convert one saved HTML file to save_dir/markdown, appending supplementary materials.
+    Module-level so ProcessPoolExecutor workers can run it.
+    """
+    # convert_file reads the file once, as bytes, and lets lxml decode it
+    markdown = _get_converter().convert_file(html_path)
+
+    # Append supplementary materials; the PMCID also names the output file
+    pmcid = os.path.basename(html_path)[: -len(".html")]
+    supplement = format_supplement_as_markdown(pmcid)
+
+    md_path = os.path.join(save_dir, "markdown", f"{pmcid}.md")
+    _write_markdown(md_path, markdown, supplement)
 
 
 class PubMedDownloader:
@@ -21,7 +122,8 @@ class PubMedDownloader:
     """
 
     def __init__(self, save_dir: str = "data"):
-        self.html_to_markdown = PubMedHTMLToMarkdownConverter()
+        # Shared per process, so constructing many downloaders builds one converter
+        self.html_to_markdown = _get_converter()
         self.save_dir = save_dir
 
     def single_pmcid_to_markdown(self, pmcid: str, include_supplements: bool = True) -> Optional[str]:
@@ -57,6 +159,7 @@ class PubMedDownloader:
     def single_pmid_to_markdown(self, pmid: str, include_supplements: bool = True) -> Optional[str]:
         """
         Convert a single PMID to markdown. Falls back to abstract-only if no PMCID.
+        Each call makes its own NCBI round-trips; use single_pmids_to_markdown for many PMIDs.
 
         Args:
             pmid (str): The PMID to convert
@@ -65,8 +168,9 @@ class PubMedDownloader:
         Returns:
             Optional[str]: The markdown content if successful, None if any step fails
         """
-        # Get PMCID
-        pmcid_mapping = get_pmcid_from_pmid([pmid])
+        # Get PMCID; the lookup cache lives at PMID_CACHE_DIR, save_dir only
+        # decides where the pmcid_from_pmid_results_*.json log is written
+        pmcid_mapping = get_pmcid_from_pmid([pmid], save_dir=self.save_dir)
         pmcid = pmcid_mapping.get(str(pmid))
 
         if pmcid is None:
@@ -96,50 +200,133 @@ class PubMedDownloader:
 
         return markdown
 
-    def check_existing_html_pmcids(self, save_dir: str = "data/") -> List[str]:
+    def single_pmids_to_markdown(
+        self, pmids: List[str], include_supplements: bool = True, concurrency: int = 3
+    ) -> Dict[str, Optional[str]]:
         """
-        Get a list of all PMCIDs that have HTML files in the save_dir/html directory.
+        Convert many PMIDs to markdown in memory, like single_pmid_to_markdown but batched:
+        one PMID->PMCID lookup, concurrent HTML fetches, and batched abstract fallbacks.
+
+        Args:
+            pmids (List[str]): The PMIDs to convert
+            include_supplements (bool): Whether to append supplementary materials (default: True)
+            concurrency (int): Number of articles fetched at once (default: 3, NCBI's limit without an API key)
+
+        Returns:
+            Dict[str, Optional[str]]: Markdown content for each PMID, None where any step failed
+        """
+        pmids = list(dict.fromkeys(str(p).strip() for p in pmids))
+        pmcid_mapping = get_pmcid_from_pmid(pmids, save_dir=self.save_dir)
+
+        results: Dict[str, Optional[str]] = {}
+        pmcids = {}
+        pmids_without_pmcid = []
+        for pmid in pmids:
+            pmcid = pmcid_mapping.get(pmid)
+            if pmcid:
+                pmcids[pmid] = pmcid
+            else:
+                pmids_without_pmcid.append(pmid)
+
+        if pmids_without_pmcid:
+            logger.warning(
+                f"{len(pmids_without_pmcid)} PMIDs are not available on PubMed Central "
+                f"(Open Access). Downloading abstracts only."
+            )
+            abstracts = get_abstracts_markdown_from_pmids(pmids_without_pmcid)
+            for pmid in pmids_without_pmcid:
+                results[pmid] = abstracts.get(pmid)
+
+        if pmcids:
+            unique_pmcids = list(dict.fromkeys(pmcids.values()))
+            htmls = run_sync(self._fetch_html_async(unique_pmcids, concurrency))
+            if include_supplements:
+                prefetch_bioc_supplements([p for p in unique_pmcids if htmls[p] is not None])
+
+            for pmid, pmcid in pmcids.items():
+                html = htmls.get(pmcid)
+                if html is None:
+                    results[pmid] = None
+                    continue
+
+                try:
+                    markdown = self.html_to_markdown.convert_html(html)
+                except Exception as e:
+                    logger.error(f"Error converting HTML to markdown for PMID {pmid}: {str(e)}")
+                    results[pmid] = None
+                    continue
+
+                if include_supplements:
+                    supplement = format_supplement_as_markdown(pmcid)
+                    if supplement:
+                        markdown = markdown.rstrip() + "\n\n" + supplement + "\n"
+                results[pmid] = markdown
+
+        # Keep the caller's order
+        return {pmid: results[pmid] for pmid in pmids}
+
+    async def _fetch_html_async(
+        self, pmcids: List[str], concurrency: int
+    ) -> Dict[str, Optional[str]]:
+        """Fetch articles concurrently over one pooled client, returning each PMCID's HTML (None on failure)."""
+        semaphore = asyncio.Semaphore(concurrency)
+        async with create_async_client(concurrency) as client:
+
+            async def fetch_one(pmcid: str) -> Optional[str]:
+                async with semaphore:
+                    return await aget_html_from_pmcid(pmcid, client)
+
+            htmls = await asyncio.gather(*(fetch_one(pmcid) for pmcid in pmcids))
+        return dict(zip(pmcids, htmls))
+
+    def check_existing_html_pmcids(self, save_dir: str = "data/") -> Set[str]:
+        """
+        Get the set of all PMCIDs that have HTML files in the save_dir/html directory.
 
         Args:
             save_dir (str): Directory to check for HTML files (default: "data/")
 
         Returns:
-            List[str]: List of PMCIDs that have existing HTML files
+            Set[str]: PMCIDs that have existing HTML files
         """
         html_dir = os.path.join(save_dir, "html")
         if not os.path.exists(html_dir):
-            return []
+            return set()
 
-        existing_html = []
-        for filename in os.listdir(html_dir):
-            if filename.endswith(".html"):
-                pmcid = filename[:-5]  # Remove .html extension
-                existing_html.append(pmcid)
-        return existing_html
+        # scandir carries the entry type, so is_file() needs no extra stat()
+        with os.scandir(html_dir) as entries:
+            return {
+                entry.name[:-5]  # Remove .html extension
+                for entry in entries
+                if entry.name.endswith(".html") and entry.is_file(follow_symlinks=False)
+            }
 
-    def check_existing_markdown_pmcids(self, save_dir: str = "data/") -> List[str]:
+    def check_existing_markdown_pmcids(self, save_dir: str = "data/") -> Set[str]:
         """
-        Get a list of all PMCIDs that have markdown files in the save_dir/markdown directory.
+        Get the set of all PMCIDs that have markdown files in the save_dir/markdown directory.
 
         Args:
             save_dir (str): Directory to check for markdown files (default: "data/")
 
         Returns:
-            List[str]: List of PMCIDs that have existing markdown files
+            Set[str]: PMCIDs that have existing markdown files
         """
         markdown_dir = os.path.join(save_dir, "markdown")
         if not os.path.exists(markdown_dir):
-            return []
+            return set()
 
-        existing_markdown = []
-        for filename in os.listdir(markdown_dir):
-            if filename.endswith(".md"):
-                pmcid = filename[:-3]  # Remove .md extension
-                existing_markdown.append(pmcid)
-        return existing_markdown
+        with os.scandir(markdown_dir) as entries:
+            return {
+                entry.name[:-3]  # Remove .md extension
+                for entry in entries
+                if entry.name.endswith(".md") and entry.is_file(follow_symlinks=False)
+            }
 
     def local_html_to_markdown(
-        self, save_dir: str = "data/", overwrite: bool = False
+        self,
+        save_dir: str = "data/",
+        overwrite: bool = False,
+        existing_markdown: Optional[Set[str]] = None,
     ) -> None:
         """
         Convert all html files in the save_dir/html directory to markdown
@@ -147,48 +334,48 @@ class PubMedDownloader:
         Args:
             save_dir (str): Directory containing HTML files (default: "data/")
             overwrite (bool): Whether to overwrite existing markdown files (default: False)
+            existing_markdown (Optional[Set[str]]): Result of an earlier
+                check_existing_markdown_pmcids scan to reuse (default: None, rescan)
         """
         html_dir = os.path.join(save_dir, "html")
         if not os.path.exists(html_dir):
             logger.warning(f"No HTML directory found at {html_dir}")
             return
 
-        htmls = os.listdir(html_dir)
-        html_paths = [os.path.join(html_dir, f) for f in htmls]
+        # PMCIDs of the saved .html files, from the same scandir pass pmcids_to_html uses
+        pmcids = sorted(self.check_existing_html_pmcids(save_dir))
 
         if not overwrite:
-            # Get existing markdown files
-            existing_markdown = self.check_existing_markdown_pmcids(save_dir)
-            logger.info(f"Found {len(existing_markdown)} existing markdown files")
+            # Get existing markdown files, unless the caller already scanned them
+            if existing_markdown is None:
+                existing_markdown = self.check_existing_markdown_pmcids(save_dir)
+                logger.info(f"Found {len(existing_markdown)} existing markdown files")
             # Filter out HTML files that already have markdown
-            htmls = [
-                html
-                for html in htmls
-                if html.replace(".html", "") not in existing_markdown
-            ]
-            html_paths = [os.path.join(html_dir, f) for f in htmls]
-
-        logger.info(f"Converting {len(htmls)} HTML files to Markdown")
-        for html_path in tqdm(
-            html_paths, desc=f"Converting html ({save_dir}/html) to markdown"
-        ):
-            markdown = self.html_to_markdown.convert_file(html_path)
+            pmcids = [pmcid for pmcid in pmcids if pmcid not in existing_markdown]
 
-            # Append supplementary materials
-            pmcid = os.path.basename(html_path).replace(".html", "")
-            supplement = format_supplement_as_markdown(pmcid)
-            if supplement:
-                markdown = markdown.rstrip() + "\n\n" + supplement + "\n"
-            else:
-                markdown = markdown.rstrip() + "\n\n## Supplementary Materials\n\nNo supplementary materials found.\n"
+        logger.info(f"Converting {len(pmcids)} HTML files to Markdown")
+        if not pmcids:
+            return
+        html_paths = [os.path.join(html_dir, f"{pmcid}.html") for pmcid in pmcids]
 
-            md_path = os.path.join(
-                save_dir,
-                "markdown",
-                f"{os.path.basename(html_path).replace('.html', '.md')}",
-            )
-            with open(md_path, "w") as f:
-                f.write(markdown)
+        # Fetch supplements for the whole batch up front (concurrently, into the
+        # shared cache) so the workers' format_supplement_as_markdown calls are cache hits
+        prefetch_bioc_supplements(pmcids)
+        # Parsing is CPU-bound and each file is independent, so spread the files
+        # over all cores; every worker builds its converter once up front
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=_get_converter
+        ) as executor:
+            for _ in tqdm(
+                executor.map(
+                    partial(_html_file_to_markdown, save_dir=save_dir),
+                    html_paths,
+                    chunksize=4,
+                ),
+                total=len(html_paths),
+                desc=f"Converting html ({save_dir}/html) to markdown",
+            ):
+                pass
 
     def pmids_to_pmcids(self, pmids: List[str], save_dir: str = "data") -> List[str]:
         """
@@ -199,8 +386,8 @@ class PubMedDownloader:
         total = len(pmids)
         logger.info(f"Getting PMCIDs for {total} PMIDs")
         pmcid_mapping = get_pmcid_from_pmid(pmids, save_dir=save_dir)
-        # Lookup using normalized keys
-        pmcids = [pmcid_mapping.get(str(pmid).strip()) for pmid in pmids]
+        # pmids are already normalized, so they can key the mapping directly
+        pmcids = (pmcid_mapping.get(pmid) for pmid in pmids)
         valid_pmcids = [pmcid for pmcid in pmcids if pmcid is not None]
         missing = total - len(valid_pmcids)
         sample = ", ".join([str(p) for p in valid_pmcids[:5]]) if valid_pmcids else ""
@@ -211,9 +398,8 @@ class PubMedDownloader:
             )
             # Show up to 5 sample lookups
             for pmid in pmids[:5]:
-                key = str(pmid).strip()
                 logger.debug(
-                    f"Lookup sample: PMID {key} -> {pmcid_mapping.get(key)} (in_mapping={key in pmcid_mapping})"
+                    f"Lookup sample: PMID {pmid} -> {pmcid_mapping.get(pmid)} (in_mapping={pmid in pmcid_mapping})"
                 )
         logger.info(
             f"Valid PMCIDs: {len(valid_pmcids)} / {total} | Missing: {missing}"
@@ -222,7 +408,9 @@ class PubMedDownloader:
             logger.debug(f"Sample PMCIDs: {sample}...")
         return valid_pmcids
 
-    def pmcids_to_html(self, pmcids: List[str], save_dir: str = "data") -> None:
+    def pmcids_to_html(
+        self, pmcids: List[str], save_dir: str = "data", concurrency: int = 3
+    ) -> None:
         """
         Convert a list of pmcids to html
         Save raw html to save_dir/html and markdown to save_dir/markdown
@@ -230,6 +418,7 @@ class PubMedDownloader:
         Args:
             pmcids (List[str]): List of PMCIDs to convert
             save_dir (str): Directory to save the files to (default: "data/")
+            concurrency (int): Number of articles fetched at once (default: 3, NCBI's limit without an API key)
         """
         # Create necessary directories
         html_dir = os.path.join(save_dir, "html")
@@ -245,20 +434,45 @@ class PubMedDownloader:
         logger.info(f"Converting {len(pmcids)} PMCIDs to HTML")
 
         # Convert to HTML
-        for pmcid in tqdm(pmcids, desc="Converting PMCIDs to HTML"):
-            html_text = get_html_from_pmcid(pmcid)
-            if html_text is None:
-                logger.error(f"No HTML found for PMCID {pmcid}")
-                continue
+        if pmcids:
+            run_sync(self._pmcids_to_html_async(pmcids, html_dir, concurrency))
 
-            # Save HTML
-            try:
-                html_path = os.path.join(html_dir, f"{pmcid}.html")
-                with open(html_path, "w") as f:
-                    f.write(html_text)
-            except Exception as e:
-                logger.error(f"Error saving HTML for PMCID {pmcid}: {str(e)}")
-                continue
+    async def _pmcids_to_html_async(
+        self, pmcids: List[str], html_dir: str, concurrency: int
+    ) -> None:
+        """Fetch and save articles concurrently over one pooled client, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        # One dedicated writer thread: saves queue up behind it in order instead
+        # of competing for the default executor, and the loop never waits on disk
+        with ThreadPoolExecutor(max_workers=1) as writer, tqdm(
+            total=len(pmcids), desc="Converting PMCIDs to HTML"
+        ) as progress:
+            async with create_async_client(concurrency) as client:
+
+                async def fetch_one(pmcid: str) -> None:
+                    async with semaphore:
+                        html_text = await aget_html_from_pmcid(pmcid, client)
+                    progress.update(1)
+                    if html_text is None:
+                        logger.error(f"No HTML found for PMCID {pmcid}")
+                        return
+                    await loop.run_in_executor(
+                        writer, self._save_html, html_dir, pmcid, html_text
+                    )
+
+                await asyncio.gather(*(fetch_one(pmcid) for pmcid in pmcids))
+
+    @staticmethod
+    def _save_html(html_dir: str, pmcid: str, html_text: str) -> None:
+        """Save one article's HTML, logging (not raising) on failure."""
+        try:
+            html_path = os.path.join(html_dir, f"{pmcid}.html")
+            # Large buffer so each article goes out in a few big writes
+            with open(html_path, "w", buffering=1 << 20) as f:
+                f.write(html_text)
+        except Exception as e:
+            logger.error(f"Error saving HTML for PMCID {pmcid}: {str(e)}")
 
     def pmids_to_markdown(
         self, pmids: List[str], save_dir: str = "data", overwrite: bool = False
@@ -278,34 +492,40 @@ class PubMedDownloader:
         pmcid_mapping = get_pmcid_from_pmid(pmids, save_dir=save_dir)
 
         # Split into PMIDs with and without PMCIDs
-        pmids_with_pmcid = []
+        valid_pmcids = []
         pmids_without_pmcid = []
         for pmid in pmids:
             pmcid = pmcid_mapping.get(pmid)
             if pmcid:
-                pmids_with_pmcid.append((pmid, pmcid))
+                valid_pmcids.append(pmcid)
             else:
                 pmids_without_pmcid.append(pmid)
 
-        valid_pmcids = [pmcid for _, pmcid in pmids_with_pmcid]
-
         # Save found pmcids
         with open(os.path.join(save_dir, "pmcids.txt"), "w") as f:
             f.write("\n".join(valid_pmcids))
 
+        existing_markdown = None
         if not overwrite:
             existing_markdown = self.check_existing_markdown_pmcids(save_dir)
             logger.info(f"Found {len(existing_markdown)} existing markdown files")
             valid_pmcids = [pmcid for pmcid in valid_pmcids if pmcid not in existing_markdown]
+            # Abstract-only files are saved as PMID{pmid}.md
+            existing_pmid_markdown = {
+                name[4:] for name in existing_markdown if name.startswith("PMID")
+            }
             pmids_without_pmcid = [
                 pmid for pmid in pmids_without_pmcid
-                if f"PMID{pmid}" not in existing_markdown
+                if pmid not in existing_pmid_markdown
             ]
 
         # Full-text path: PMCIDs -> HTML -> Markdown
         logger.info(f"Converting {len(valid_pmcids)} PMCIDs to Markdown (full text)")
         self.pmcids_to_html(valid_pmcids, save_dir)
-        self.local_html_to_markdown(save_dir, overwrite=overwrite)
+        # No markdown has been written since the scan above, so it is still current
+        self.local_html_to_markdown(
+            save_dir, overwrite=overwrite, existing_markdown=existing_markdown
+        )
 
         # Abstract fallback for PMIDs without PMCIDs
         if pmids_without_pmcid:
@@ -316,25 +536,22 @@ class PubMedDownloader:
             markdown_dir = os.path.join(save_dir, "markdown")
             os.makedirs(markdown_dir, exist_ok=True)
 
-            for pmid in tqdm(pmids_without_pmcid, desc="Fetching abstracts for non-OA articles"):
+            # One E-Fetch request per 200 PMIDs, paced between batches, instead of
+            # one request per PMID with a fixed sleep after each
+            abstracts = get_abstracts_markdown_from_pmids(pmids_without_pmcid)
+
+            for pmid in tqdm(pmids_without_pmcid, desc="Saving abstracts for non-OA articles"):
                 logger.warning(
                     f"PMID {pmid} is not available on PubMed Central (Open Access). "
                     f"Downloading abstract only."
                 )
-                markdown = get_abstract_markdown_from_pmid(pmid)
+                markdown = abstracts.get(pmid)
                 if markdown is None:
                     logger.error(f"Failed to fetch abstract for PMID {pmid}")
-                    time.sleep(0.5)
                     continue
 
-                markdown = markdown.rstrip() + "\n\n## Supplementary Materials\n\nNo supplementary materials found.\n"
-
                 md_path = os.path.join(markdown_dir, f"PMID{pmid}.md")
-                with open(md_path, "w") as f:
-                    f.write(markdown)
-
-                # Respect NCBI rate limit (~3 requests/sec without API key)
-                time.sleep(0.4)
+                _write_markdown(md_path, markdown, None)
 
     def add_supplements_to_existing(
         self, save_dir: str = "data", overwrite: bool = False
@@ -363,41 +580,21 @@ class PubMedDownloader:
         logger.info(f"Prefetching supplements for {len(pmcids)} articles")
         prefetch_bioc_supplements(pmcids)
 
-        added = 0
-        skipped = 0
-        for md_file in tqdm(md_files, desc="Adding supplements"):
-            md_path = os.path.join(markdown_dir, md_file)
-            pmcid = md_file.replace(".md", "")
-
-            with open(md_path, "r") as f:
-                content = f.read()
-
-            has_supplements = "## Supplementary Materials" in content
-
-            # Some articles contain an HTML-derived "Supplementary Materials" section
-            # that is not the BioC supplement text we add (often just a link/stub).
-            # Only skip when BioC-style content is already present (e.g., headings
-            # that look like supplementary PDF filenames).
-            has_bioc_supplements = bool(re.search(r"^###\s+.*\.pdf\s*$", content, re.MULTILINE))
-
-            if has_supplements and has_bioc_supplements and not overwrite:
-                skipped += 1
-                continue
-
-            supplement = format_supplement_as_markdown(pmcid)
-            if not supplement:
-                continue
-
-            if has_supplements and overwrite:
-                # Remove old supplement section (everything from ## Supplementary Materials onward)
-                idx = content.index("## Supplementary Materials")
-                content = content[:idx].rstrip()
-
-            content = content.rstrip() + "\n\n" + supplement + "\n"
-
-            with open(md_path, "w") as f:
-                f.write(content)
-            added += 1
+        # Each file is independent and mostly disk I/O (supplements were just
+        # prefetched into the cache), so work through them on a thread pool
+        md_paths = [os.path.join(markdown_dir, f) for f in md_files]
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            results = list(
+                tqdm(
+                    executor.map(
+                        partial(_add_supplement_to_file, overwrite=overwrite), md_paths
+                    ),
+                    total=len(md_paths),
+                    desc="Adding supplements",
+                )
+            )
+        added = results.count(True)
+        skipped = results.count(False)
 
         logger.info(
             f"Supplements added: {added}, skipped (already present): {skipped}"
@@ -409,12 +606,14 @@ def clear_all_caches() -> None:
     Remove all cached data created by this package.
 
     Currently clears:
-    - PMID->PMCID cache file located at `PMID_CACHE_DIR/PMID_CACHE_FILE` (defaults to `data/cache/pmid_to_pmcid.json`).
-    - Empties the `PMID_CACHE_DIR` folder if it exists and becomes empty.
+    - PMID->PMCID cache file located at `PMID_CACHE_DIR/PMID_CACHE_FILE` (defaults to `data/cache/pmid_to_pmcid.sqlite`).
+    - Removes the `PMID_CACHE_DIR` folder and everything else cached in it.
     """
     try:
         # Import locally to avoid circular import at module load
         from .pmcid_from_pmid import _get_cache_file_path  # type: ignore
+        from .pmcid_from_pmid import _reset_cache as _reset_pmid_cache  # type: ignore
+        from .utils_bioc import _reset_cache as _reset_bioc_cache  # type: ignore
 
         cache_file: Path = _get_cache_file_path()
         cache_dir: Path = cache_file.parent
@@ -427,33 +626,17 @@ def clear_all_caches() -> None:
             except Exception as e:
                 logger.warning(f"Failed to remove cache file {cache_file}: {e}")
 
-        # If the cache directory exists, remove it if empty; otherwise, offer to clear contents
+        # Remove whatever else is cached alongside it (e.g. BioC supplements) in one pass
         if cache_dir.exists():
-            # Attempt to remove directory if empty
             try:
-                cache_dir.rmdir()
-                logger.info(f"Removed empty cache directory: {cache_dir}")
-            except OSError:
-                # Directory not empty; remove its contents
-                removed_any = False
-                for child in cache_dir.iterdir():
-                    try:
-                        if child.is_dir():
-                            shutil.rmtree(child)
-                        else:
-                            child.unlink()
-                        removed_any = True
-                        logger.info(f"Removed cached item: {child}")
-                    except Exception as e:
-                        logger.warning(f"Failed to remove cached item {child}: {e}")
-                if removed_any:
-                    # Try removing directory again after clearing contents
-                    try:
-                        cache_dir.rmdir()
-                        logger.info(f"Removed cache directory: {cache_dir}")
-                    except Exception:
-                        # It's okay if it still exists; leave it
-                        pass
+                shutil.rmtree(cache_dir)
+                logger.info(f"Removed cache directory: {cache_dir}")
+            except Exception as e:
+                logger.warning(f"Failed to remove cache directory {cache_dir}: {e}")
+        # The cache helpers memoize their setup; make them recreate the databases
+        _get_cache_file_path.cache_clear()
+        _reset_pmid_cache()
+        _reset_bioc_cache()
         logger.info("All caches cleared.")
     except Exception as e:
         logger.error(f"Error while clearing caches: {e}")
@@ -471,7 +654,9 @@ def convert_pmids_from_file(
         overwrite (bool): Whether to overwrite existing markdown files (default: False)
     """
     converter = PubMedDownloader()
-    pmids = [line.strip() for line in open(file_path, "r").readlines() if line.strip()]
+    # Iterate the open file so only one line is in memory at a time
+    with open(file_path, "r") as f:
+        pmids = [pmid for pmid in (line.strip() for line in f) if pmid]
     converter.pmids_to_markdown(pmids, save_dir, overwrite)
 
 
@@ -8,21 +8,147 @@ and parsing PDFs ourselves.
 API Documentation: https://www.ncbi.nlm.nih.gov/research/bionlp/APIs/FAIR-SMART/
 """
 
+import asyncio
 import json
-import time
+import os
+import sqlite3
+import threading
+from contextlib import closing
 from pathlib import Path
+from typing import Optional
 
+import httpx
+import orjson
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ._async_utils import RateLimiter, retry_after_seconds, run_sync
 
 BIOC_BASE_URL = "https://www.ncbi.nlm.nih.gov/research/bionlp/RESTful/supplmat.cgi"
-CACHE_DIR = Path("data/cache/bioc_supplements")
+# NCBI asks for at most 3 requests/sec per client
+BIOC_RPS = 3
+# How many times a prefetch request is retried after a 429 or 5xx
+MAX_PREFETCH_RETRIES = 3
+CACHE_DB = Path("data/cache/bioc_supplements.sqlite")
+# One-JSON-file-per-PMCID cache used by earlier versions; imported into CACHE_DB once
+LEGACY_CACHE_DIR = Path("data/cache/bioc_supplements")
+
+
+def _create_session() -> requests.Session:
+    """Create a session that keeps connections to NCBI alive and retries transient failures."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # Hand the final response back so the status checks below see it
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _create_session()
+
+
+# The database is set up once (per _reset_cache()), then every thread keeps its own
+# connection, so a cache lookup is a single SELECT
+_cache_lock = threading.Lock()
+_cache_generation = 0
+_cache_ready_generation: Optional[int] = None
+_thread_local = threading.local()
+
+
+def _init_cache_db() -> None:
+    """Create the cache directory and schema, importing the legacy cache into a new database."""
+    CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+    is_new = not CACHE_DB.exists()
+    with closing(sqlite3.connect(CACHE_DB, timeout=30)) as conn:
+        # WAL mode is stored in the database file, so later connections inherit it
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS supplements (pmcid TEXT PRIMARY KEY, data TEXT)"
+        )
+        if is_new and LEGACY_CACHE_DIR.is_dir():
+            _import_legacy_cache(conn)
+
+
+def _connect_cache() -> sqlite3.Connection:
+    """Return this thread's cache connection, setting up the database on first use."""
+    global _cache_ready_generation
+    conn = getattr(_thread_local, "conn", None)
+    if conn is not None:
+        # Reuse it unless the cache was reset or this is a forked child
+        if _thread_local.key == (os.getpid(), _cache_generation):
+            return conn
+        _thread_local.conn = None
+        if _thread_local.key[0] == os.getpid():
+            conn.close()
+
+    with _cache_lock:
+        generation = _cache_generation
+        if _cache_ready_generation != generation:
+            _init_cache_db()
+            _cache_ready_generation = generation
+
+    conn = sqlite3.connect(CACHE_DB, timeout=30)
+    _thread_local.conn = conn
+    _thread_local.key = (os.getpid(), generation)
+    return conn
+
+
+def _reset_cache() -> None:
+    """Forget the set-up database (e.g. after deleting it); connections reopen on next use."""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+
+
+def _import_legacy_cache(conn: sqlite3.Connection) -> None:
+    """Copy per-PMCID JSON cache files into the database, keeping newer rows."""
+    rows = []
+    for path in LEGACY_CACHE_DIR.glob("*.json"):
+        try:
+            rows.append((path.stem, path.read_text()))
+        except OSError:
+            continue
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO supplements VALUES (?, ?)", rows)
+    logger.info(f"Imported {len(rows)} cached supplements from {LEGACY_CACHE_DIR}")
+
+
+def _load_cache(pmcid: str) -> Optional[dict]:
+    """Load the cached entry for a PMCID, or None if missing or unreadable."""
+    return _load_cache_many([pmcid]).get(pmcid)
 
 
-def _get_cache_path(pmcid: str) -> Path:
-    """Get the cache file path for a PMCID."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    return CACHE_DIR / f"{pmcid}.json"
+def _load_cache_many(pmcids: list[str]) -> dict[str, dict]:
+    """Load the cached entries for several PMCIDs, skipping missing or corrupted ones."""
+    cache = {}
+    try:
+        conn = _connect_cache()
+        # SQLite caps the number of bound parameters per statement
+        for i in range(0, len(pmcids), 500):
+            chunk = pmcids[i : i + 500]
+            rows = conn.execute(
+                "SELECT pmcid, data FROM supplements WHERE pmcid IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for pmcid, data in rows:
+                try:
+                    cache[pmcid] = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.debug(f"Corrupted cache for {pmcid}, refetching")
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to load cache from {CACHE_DB}: {e}")
+    return cache
 
 
 def fetch_bioc_supplement(pmcid: str, use_cache: bool = True) -> str | None:
@@ -37,58 +163,73 @@ def fetch_bioc_supplement(pmcid: str, use_cache: bool = True) -> str | None:
         Extracted text from all supplementary materials, or None if not available.
     """
     # Check cache first
-    cache_path = _get_cache_path(pmcid)
-    if use_cache and cache_path.exists():
-        try:
-            with open(cache_path) as f:
-                cached = json.load(f)
-                if cached.get("text"):
-                    return cached["text"]
-                elif cached.get("not_available"):
-                    return None
-        except (json.JSONDecodeError, KeyError):
-            pass  # Cache corrupted, refetch
+    cached = _load_cache(pmcid) if use_cache else None
+    if cached:
+        if cached.get("text"):
+            return cached["text"]
+        elif cached.get("not_available"):
+            return None
 
     # Fetch from BioC API
     url = f"{BIOC_BASE_URL}/BioC_JSON/{pmcid}/All"
 
     try:
-        response = requests.get(url, timeout=30)
-
-        if response.status_code != 200:
-            logger.debug(f"No supplements found for {pmcid} (HTTP {response.status_code})")
-            _save_cache(cache_path, {"not_available": True})
-            return None
+        response = _session.get(url, timeout=30)
+    except requests.RequestException as e:
+        logger.warning(f"BioC API request failed for {pmcid}: {e}")
+        return None
 
-        content = response.text
-        if not content or len(content) < 50:
-            logger.debug(f"No supplements found for {pmcid} (empty response)")
-            _save_cache(cache_path, {"not_available": True})
-            return None
+    entry = _cache_entry_from_response(pmcid, response.status_code, response.content)
+    if entry is None:
+        return None
+    _save_cache(pmcid, entry)
+    return entry.get("text")
 
-        # Parse BioC JSON and extract text
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            # The BioC API returns non-JSON (HTML) when no supplements exist
-            logger.debug(f"No supplements found for {pmcid}")
-            _save_cache(cache_path, {"not_available": True})
-            return None
 
-        all_text = _extract_text_from_bioc(data)
+def _is_transient_status(status_code: int) -> bool:
+    """Whether an HTTP status says "try again later" rather than "no supplements"."""
+    return status_code == 429 or status_code >= 500
 
-        if all_text:
-            _save_cache(cache_path, {"text": all_text})
-            return all_text
-        else:
-            logger.debug(f"No supplements found for {pmcid} (no text in response)")
-            _save_cache(cache_path, {"not_available": True})
-            return None
 
-    except requests.RequestException as e:
-        logger.warning(f"BioC API request failed for {pmcid}: {e}")
+def _cache_entry_from_response(
+    pmcid: str, status_code: int, content: bytes
+) -> Optional[dict]:
+    """
+    Turn a BioC API response into the dict stored in the cache: either
+    {"text": ..., "documents": [...]} or {"not_available": True}. Returns None
+    for rate-limit and server errors, which must not be cached.
+    """
+    if _is_transient_status(status_code):
+        logger.warning(f"BioC API returned HTTP {status_code} for {pmcid}")
         return None
 
+    if status_code != 200:
+        logger.debug(f"No supplements found for {pmcid} (HTTP {status_code})")
+        return {"not_available": True}
+
+    if not content or len(content) < 50:
+        logger.debug(f"No supplements found for {pmcid} (empty response)")
+        return {"not_available": True}
+
+    # Parse BioC JSON straight from the response bytes and extract text
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # The BioC API returns non-JSON (HTML) when no supplements exist
+        logger.debug(f"No supplements found for {pmcid}")
+        return {"not_available": True}
+
+    docs = _extract_text_from_bioc_structured(data)
+    all_text = "\n\n".join(doc["text"] for doc in docs)
+
+    if not all_text:
+        logger.debug(f"No supplements found for {pmcid} (no text in response)")
+        return {"not_available": True}
+
+    # Keep the per-file documents so format_supplement_as_markdown
+    # can be served from the cache
+    return {"text": all_text, "documents": docs}
+
 
 def _extract_text_from_bioc_structured(data: list | dict) -> list[dict[str, str]]:
     """
@@ -111,34 +252,33 @@ def _extract_text_from_bioc_structured(data: list | dict) -> list[dict[str, str]
         }
     ]
     """
-    documents = []
-
     # Handle both list and dict responses
-    collections = data if isinstance(data, list) else [data]
+    collections = data if isinstance(data, list) else (data,)
 
+    documents = []
     for collection in collections:
         if not isinstance(collection, dict):
             continue
 
-        for doc in collection.get("documents", []):
+        for doc in collection.get("documents", ()):
             if not isinstance(doc, dict):
                 continue
 
-            filename = doc.get("id", "unknown")
-            passages = []
-
-            for passage in doc.get("passages", []):
-                if not isinstance(passage, dict):
-                    continue
-
-                text = passage.get("text", "")
-                if text and isinstance(text, str):
-                    passages.append(text)
-
-            if passages:
-                documents.append(
-                    {"filename": filename, "text": "\n\n".join(passages)}
+            passages = doc.get("passages", ())
+            try:
+                # Fast path for well-formed responses: every passage is a dict
+                # with a string "text"
+                text = "\n\n".join([p["text"] for p in passages if p["text"]])
+            except (TypeError, KeyError):
+                text = "\n\n".join(
+                    t
+                    for passage in passages
+                    if isinstance(passage, dict)
+                    and (t := passage.get("text"))
+                    and isinstance(t, str)
                 )
+            if text:
+                documents.append({"filename": doc.get("id", "unknown"), "text": text})
 
     return documents
 
@@ -166,51 +306,41 @@ def format_supplement_as_markdown(pmcid: str, use_cache: bool = True) -> str | N
         or None if no supplements are available.
     """
     # Check cache first
-    cache_path = _get_cache_path(pmcid)
-    if use_cache and cache_path.exists():
-        try:
-            with open(cache_path) as f:
-                cached = json.load(f)
-                if cached.get("not_available"):
-                    return None
-        except (json.JSONDecodeError, KeyError):
-            pass
+    cached = _load_cache(pmcid) if use_cache else None
+    if cached:
+        if cached.get("not_available"):
+            return None
+        if cached.get("documents"):
+            return _format_documents_as_markdown(cached["documents"])
+        # Entries holding only flat text lack per-file structure; refetch
 
     # Fetch from BioC API
     url = f"{BIOC_BASE_URL}/BioC_JSON/{pmcid}/All"
 
-    # Try cache for raw data first
-    raw_data = None
-    if use_cache and cache_path.exists():
-        try:
-            with open(cache_path) as f:
-                cached = json.load(f)
-                if cached.get("text"):
-                    # We have cached flat text but need structured data; refetch
-                    raw_data = None
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    if raw_data is None:
-        try:
-            response = requests.get(url, timeout=30)
-            if response.status_code != 200:
-                return None
-            content = response.text
-            if not content or len(content) < 50:
-                return None
-            raw_data = json.loads(content)
-        except (requests.RequestException, json.JSONDecodeError):
+    try:
+        response = _session.get(url, timeout=30)
+        if response.status_code != 200:
+            return None
+        content = response.content
+        if not content or len(content) < 50:
             return None
+        raw_data = orjson.loads(content)
+    except (requests.RequestException, orjson.JSONDecodeError):
+        return None
 
     docs = _extract_text_from_bioc_structured(raw_data)
     if not docs:
         return None
 
-    # Also update the flat-text cache
+    # Also update the cache
     flat_text = "\n\n".join(doc["text"] for doc in docs)
-    _save_cache(cache_path, {"text": flat_text})
+    _save_cache(pmcid, {"text": flat_text, "documents": docs})
+
+    return _format_documents_as_markdown(docs)
+
 
+def _format_documents_as_markdown(docs: list[dict[str, str]]) -> str:
+    """Render structured BioC documents as a ## Supplementary Materials section."""
     lines = ["## Supplementary Materials"]
     for doc in docs:
         lines.append(f"\n### {doc['filename']}\n")
@@ -219,13 +349,17 @@ def format_supplement_as_markdown(pmcid: str, use_cache: bool = True) -> str | N
     return "\n".join(lines)
 
 
-def _save_cache(cache_path: Path, data: dict) -> None:
-    """Save data to cache file."""
+def _save_cache(pmcid: str, data: dict) -> None:
+    """Save a PMCID's entry to the cache database."""
     try:
-        with open(cache_path, "w") as f:
-            json.dump(data, f)
-    except OSError as e:
-        logger.warning(f"Failed to save cache to {cache_path}: {e}")
+        conn = _connect_cache()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO supplements VALUES (?, ?)",
+                (pmcid, json.dumps(data)),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to save cache for {pmcid} to {CACHE_DB}: {e}")
 
 
 def get_bioc_supplement_cached(pmcid: str) -> str | None:
@@ -237,42 +371,108 @@ def get_bioc_supplement_cached(pmcid: str) -> str | None:
     return fetch_bioc_supplement(pmcid, use_cache=True)
 
 
-def prefetch_bioc_supplements(pmcids: list[str], delay: float = 0.2) -> dict[str, bool]:
+async def _prefetch_one(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    limiter: RateLimiter,
+    pmcid: str,
+) -> bool:
+    """Fetch and cache one PMCID's supplements; returns whether any were available."""
+    url = f"{BIOC_BASE_URL}/BioC_JSON/{pmcid}/All"
+    async with semaphore:
+        for attempt in range(MAX_PREFETCH_RETRIES + 1):
+            await limiter.wait()
+            try:
+                response = await client.get(url)
+            except httpx.HTTPError as e:
+                logger.warning(f"BioC API request failed for {pmcid}: {e}")
+                return False
+            if (
+                _is_transient_status(response.status_code)
+                and attempt < MAX_PREFETCH_RETRIES
+            ):
+                retry_after = retry_after_seconds(response)
+                logger.warning(
+                    f"BioC API returned HTTP {response.status_code} for {pmcid}, "
+                    f"retrying in {retry_after:.1f}s"
+                )
+                # Everyone waits, not just this request: the server is overloaded
+                limiter.back_off(retry_after)
+                continue
+            break
+
+    # Decoding and parsing large BioC JSON is CPU-bound; keep it off the event
+    # loop so other requests' I/O overlaps with it
+    entry = await asyncio.to_thread(_parse_and_cache, pmcid, response)
+    return bool(entry and entry.get("text"))
+
+
+def _parse_and_cache(pmcid: str, response: httpx.Response) -> Optional[dict]:
+    """Build the cache entry for a BioC response (parsing its body) and save it."""
+    entry = _cache_entry_from_response(pmcid, response.status_code, response.content)
+    if entry is not None:
+        _save_cache(pmcid, entry)
+    return entry
+
+
+async def _prefetch_many(
+    pmcids: list[str], delay: float, max_concurrency: int
+) -> dict[str, bool]:
+    """
+    Prefetch PMCIDs concurrently: at most `max_concurrency` requests in flight,
+    and request starts spaced at least `delay` seconds apart.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(delay)
+    results = {}
+    async with httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(max_connections=max_concurrency),
+    ) as client:
+
+        async def prefetch(pmcid: str):
+            results[pmcid] = await _prefetch_one(client, semaphore, limiter, pmcid)
+            if len(results) % 10 == 0:
+                hits = sum(1 for v in results.values() if v)
+                logger.info(
+                    f"Prefetched {len(results)}/{len(pmcids)} | Found: {hits} ({100*hits/len(results):.1f}%)"
+                )
+
+        await asyncio.gather(*(prefetch(pmcid) for pmcid in pmcids))
+    return results
+
+
+def prefetch_bioc_supplements(
+    pmcids: list[str], delay: float = 1 / BIOC_RPS, max_concurrency: int = 3
+) -> dict[str, bool]:
     """
     Prefetch and cache BioC supplements for a list of PMCIDs.
+    Rate-limited and server errors are retried (honoring Retry-After) and never cached.
 
     Args:
         pmcids: List of PMCIDs to prefetch
-        delay: Delay between API calls to be nice to the server
+        delay: Minimum seconds between request starts (default: NCBI's 3 requests/sec)
+        max_concurrency: Number of API requests in flight at once
 
     Returns:
         Dict mapping PMCID to whether supplement was available
     """
     results = {}
+    to_fetch = []
+    cache = _load_cache_many(pmcids)
+
+    for pmcid in pmcids:
+        cached = cache.get(pmcid)
+        # Flat-text-only entries are refetched to pick up per-file documents
+        if cached and (cached.get("not_available") or cached.get("documents")):
+            results[pmcid] = bool(cached.get("text"))
+        else:
+            to_fetch.append(pmcid)
 
-    for i, pmcid in enumerate(pmcids):
-        cache_path = _get_cache_path(pmcid)
-
-        if cache_path.exists():
-            # Already cached
-            try:
-                with open(cache_path) as f:
-                    cached = json.load(f)
-                    results[pmcid] = bool(cached.get("text"))
-                continue
-            except (json.JSONDecodeError, KeyError):
-                logger.debug(f"Corrupted cache for {pmcid}, refetching")
-                cache_path.unlink(missing_ok=True)
-
-        # Fetch from API
-        text = fetch_bioc_supplement(pmcid, use_cache=False)
-        results[pmcid] = text is not None
-
-        if (i + 1) % 10 == 0:
-            hits = sum(1 for v in results.values() if v)
-            logger.info(f"Prefetched {i + 1}/{len(pmcids)} | Found: {hits} ({100*hits/(i+1):.1f}%)")
-
-        time.sleep(delay)
+    # Fetch the rest from the API concurrently
+    if to_fetch:
+        fetched = run_sync(_prefetch_many(to_fetch, delay, max_concurrency))
+        results.update(fetched)
 
     available = sum(1 for v in results.values() if v)
     logger.info(f"Prefetch complete: {available}/{len(pmcids)} have BioC supplements")